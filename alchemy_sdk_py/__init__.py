@@ -1,2 +1,4 @@
 # flake8: noqa
 from .alchemy import Alchemy
+from .async_alchemy import AsyncAlchemy
+from .utils import BloomFilter
@@ -1,13 +1,73 @@
-import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime
-from typing import List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from .errors import NO_API_KEY_ERROR
-from .evm_node import POSSIBLE_BLOCK_TAGS, EVM_Node, HEADERS
-from .networks import Network
-from .utils import HexIntStringNumber, ETH_NULL_VALUE, is_hash
+from .evm_node import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    MAX_RETRY_BACKOFF,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_JITTER,
+    EVM_Node,
+)
+from .networks import Network, get_network_urls
+from .utils import (
+    ETH_NULL_VALUE,
+    BloomFilter,
+    classify_block_identifier,
+    chunked,
+    json_dumps,
+    json_loads,
+    normalize_address,
+    to_block_tag,
+    to_hex,
+    to_int,
+)
+
+try:
+    from websockets.exceptions import WebSocketException
+    from websockets.sync.client import connect as websocket_connect
+except ImportError:  # pragma: no cover - websockets is only needed for use_websocket
+    WebSocketException = None
+    websocket_connect = None
 
 NFT_FILTERS = ["SPAM", "AIRDROPS"]
+DEFAULT_TRANSFER_CATEGORIES = ("external", "internal", "erc20", "erc721", "specialnft")
+DEFAULT_PROBES_PER_ROUND = 3
+SPAM_CONTRACTS_TTL = 3600
+NFT_METADATA_BATCH_SIZE = 100
+DEFAULT_POLL_INTERVAL = 2.0
+MAX_POLL_INTERVAL = 5.0
+POLL_BACKOFF = 1.5
+# Roughly one block time, so the first poll after a transaction is mined finds it
+POLL_INTERVALS = {
+    "eth_mainnet": 2.0,
+    "eth_goerli": 2.0,
+    "opt_mainnet": 0.5,
+    "opt_goerli": 0.5,
+    "arb_mainnet": 0.25,
+    "arb_rinkeby": 0.25,
+    "matic_mainnet": 1.0,
+    "matic_mumbai": 1.0,
+    "astar_mainnet": 1.0,
+}
+FEE_METHOD_PARAMS = {
+    "eth_feeHistory": [to_hex(1), "latest"],
+    "eth_maxPriorityFeePerGas": [],
+    "eth_gasPrice": [],
+}
 
 
 class Alchemy(EVM_Node):
@@ -19,6 +79,10 @@ class Alchemy(EVM_Node):
         retries: Optional[int] = 0,
         proxy: Optional[dict] = None,
         url: Optional[str] = None,
+        known_contracts: Optional[BloomFilter] = None,
+        base_backoff: float = RETRY_BACKOFF_FACTOR,
+        max_backoff: float = MAX_RETRY_BACKOFF,
+        jitter: float = RETRY_JITTER,
     ):
         """A python class to interact with the Alchemy API
 
@@ -29,6 +93,10 @@ class Alchemy(EVM_Node):
             retries (Optional[int], optional): The number of times to retry a request. Defaults to 0.
             proxy (Optional[dict], optional): A proxy to use for requests. Defaults to None.
             url (Optional[str], optional): A custom url to use for requests. Defaults to None.
+            base_backoff, max_backoff, jitter (float, optional): How long to wait between retries.
+            known_contracts (Optional[BloomFilter], optional): A filter of every contract address you care about,
+            ie: `BloomFilter.from_addresses(addresses)`. `find_contract_deployer` rejects addresses that
+            aren't in it without making any API calls. Defaults to None.
 
             Check the evm_node.py file for more details on these arguments and initialization.
 
@@ -42,22 +110,56 @@ class Alchemy(EVM_Node):
             retries=retries,
             proxy=proxy,
             url=url,
+            base_backoff=base_backoff,
+            max_backoff=max_backoff,
+            jitter=jitter,
         )
+        # Deployers are expensive to find and tiny to store, so they get their own
+        # cache instead of competing with blocks and code for room in the LRU
+        self._deployer_cache = {}
+        # (fetched at, lowercased addresses) of the spam contract list
+        self._spam_contracts = (None, frozenset())
+        self.spam_contracts_ttl = SPAM_CONTRACTS_TTL
+        self.known_contracts = known_contracts
+        self._set_urls()
+
+    def clear_cache(self):
+        """Drops every cached result, including contract deployers."""
+        super().clear_cache()
+        self._deployer_cache.clear()
+        self._spam_contracts = (None, frozenset())
+
+    def _set_urls(self):
+        """Builds the NFT, websocket and webhook urls. Called again whenever the key or network changes."""
+        self._nft_url = (
+            f"https://{self.url_network_name}.g.alchemy.com/nft/v2/{self.api_key}"
+        )
+        self._ws_url = f"wss://{self.url_network_name}.g.alchemy.com/v2/{self.api_key}"
+        self._webhook_url = "https://dashboard.alchemy.com/api"
+        # (url, rest endpoint) -> the joined url, so GET calls don't rebuild it every time
+        self._rest_urls = {}
+
+    def _rest_url(self, url: str, rest_endpoint: str) -> str:
+        key = (url, rest_endpoint)
+        rest_url = self._rest_urls.get(key)
+        if rest_url is None:
+            rest_url = self._rest_urls[key] = f"{url}/{rest_endpoint}"
+        return rest_url
 
     @property
     def nft_url(self) -> str:
         """The url for the NFT API"""
-        return f"https://{self.url_network_name}.g.alchemy.com/nft/v2/{self.api_key}"
+        return self._nft_url
 
     @property
     def ws_url(self) -> str:
         """The url for the websocket"""
-        return f"wss://{self.url_network_name}.g.alchemy.com/v2/{self.api_key}"
+        return self._ws_url
 
     @property
     def webhook_url(self) -> str:
         """The url for the webhook"""
-        return f"https://dashboard.alchemy.com/api"
+        return self._webhook_url
 
     ############################################################
     ################ Alchemy SDK Methods ######################
@@ -75,79 +177,165 @@ class Alchemy(EVM_Node):
         returns:
             The transaction receipts for the block
         """
-        input = {}
-        if is_hash(block_number_or_hash):
-            input = {"blockHash": block_number_or_hash}
-        else:
-            input = {"blockNumber": HexIntStringNumber(block_number_or_hash).hex}
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "alchemy_getTransactionReceipts",
-            "params": [input],
-        }
+        payload = self._transaction_receipts_payload(block_number_or_hash)
         json_response = self._handle_api_call(
             payload, endpoint="getTransactionReceipts"
         )
         result = json_response.get("result", {"receipts": []})
         return result["receipts"]
 
+    def iter_transaction_receipts(
+        self,
+        block_number_or_hash: Union[str, int],
+    ) -> Iterator[dict]:
+        """Like `get_transaction_receipts`, but yields the receipts one at a time as the response is read,
+        instead of loading the whole (sometimes multi-MB) response into memory first.
+        Install ijson to get the streaming behavior.
+
+        params:
+            block_number_or_hash: The block number or hash
+        returns:
+            An iterator over the transaction receipts for the block
+        """
+        payload = self._transaction_receipts_payload(block_number_or_hash)
+        return self._handle_streamed_api_call(
+            payload, "result.receipts.item", endpoint="getTransactionReceipts"
+        )
+
+    def _transaction_receipts_payload(
+        self, block_number_or_hash: Union[str, int]
+    ) -> dict:
+        kind = classify_block_identifier(block_number_or_hash)
+        if kind == "hash":
+            input = {"blockHash": block_number_or_hash}
+        elif kind == "tag":
+            input = {"blockNumber": block_number_or_hash.lower()}
+        else:
+            input = {"blockNumber": to_hex(block_number_or_hash)}
+        return self._rpc("alchemy_getTransactionReceipts", [input])
+
     def binary_search_first_block(
         self,
         from_block: Union[str, int],
         to_block: Union[str, int],
         contract_address: str,
+        probes_per_round: int = DEFAULT_PROBES_PER_ROUND,
     ) -> int:
         """
         params:
             from_block: int (1), hex ("0x1"), or str "1"
             to_block: int (1), hex ("0x1"), or str "1"
             contract_address: The address of the contract
+            probes_per_round: How many eth_getCode calls to batch per round trip, at least 1
         returns:
             The first block where the contract was deployed
         """
         if not isinstance(contract_address, str):
             raise TypeError("contract_address must be a string")
-        from_block = HexIntStringNumber(from_block)
-        to_block = HexIntStringNumber(to_block)
-        if from_block.int >= to_block.int:
-            return to_block.int
-        mid_block = HexIntStringNumber((from_block.int + to_block.int) // 2)
-        code = self.get_code(contract_address, mid_block.hex)
-        if code == ETH_NULL_VALUE:
-            return self.binary_search_first_block(
-                mid_block.int + 1, to_block.int, contract_address
+        if probes_per_round < 1:
+            raise ValueError("probes_per_round must be at least 1")
+        low = to_int(from_block)
+        high = to_int(to_block)
+        address_key = normalize_address(contract_address)
+        while low < high:
+            # Probe evenly spaced blocks in one batch so each round trip narrows
+            # the search by (probes_per_round + 1)x instead of 2x
+            probes = sorted(
+                {
+                    low + (high - low) * step // (probes_per_round + 1)
+                    for step in range(1, probes_per_round + 1)
+                }
             )
-        return self.binary_search_first_block(
-            from_block.int, mid_block.int, contract_address
-        )
-
-    def find_contract_deployer(self, contract_address: str) -> Tuple[str, int]:
+            probe_hexes = [hex(probe) for probe in probes]
+            cache_keys = [
+                (self.network.name, "eth_getCode", address_key, probe_hex)
+                for probe_hex in probe_hexes
+            ]
+            codes = [self._cache.get(cache_key) for cache_key in cache_keys]
+            missing = [index for index, code in enumerate(codes) if code is None]
+            payloads = [
+                self._rpc(
+                    "eth_getCode",
+                    [contract_address, probe_hexes[index]],
+                    id_offset=payload_index,
+                )
+                for payload_index, index in enumerate(missing)
+            ]
+            json_responses = self._handle_batch_api_call(payloads)
+            for index, json_response in zip(missing, json_responses):
+                codes[index] = json_response.get("result")
+                if self._is_final_block(probes[index]):
+                    self._cache.set(cache_keys[index], codes[index])
+            for probe, code in zip(probes, codes):
+                if code != ETH_NULL_VALUE:
+                    high = probe
+                    break
+                low = probe + 1
+        return high
+
+    def find_contract_deployer(
+        self, contract_address: str, skip_known_non_contracts: bool = False
+    ) -> Tuple[str, int]:
         """
         params:
             contract_address: The address of the contract
+            skip_known_non_contracts: If True, addresses this instance has already seen without code
+            are rejected without making any API calls. Off by default, since code can be deployed
+            to an address later on.
         returns:
             The address of the contract deployer
+
+        Results are cached per network, since a contract's deployer never changes.
+        If this instance was given `known_contracts`, addresses that aren't in it are rejected right away.
         """
         if not isinstance(contract_address, str):
             raise TypeError("contract_address must be a string")
-        current_block_number = self.get_block("latest")["number"]
-        code = self.get_code(contract_address, current_block_number)
+        target_address = normalize_address(contract_address)
+        cache_key = (self.network.name, target_address)
+        deployer = self._deployer_cache.get(cache_key)
+        if deployer is not None:
+            return deployer
+        if (
+            self.known_contracts is not None
+            and target_address not in self.known_contracts
+        ):
+            raise ValueError("Contract not found")
+        non_contract_key = (self.network.name, "non_contract", target_address)
+        if skip_known_non_contracts and non_contract_key in self._cache:
+            raise ValueError("Contract not found")
+        # The head block number and the latest code don't depend on each other,
+        # so fetch both in one round trip
+        block_number_response, code_response = self._handle_batch_api_call(
+            [
+                self._rpc("eth_blockNumber"),
+                self._rpc("eth_getCode", [contract_address, "latest"], id_offset=1),
+            ]
+        )
+        current_block_number = to_int(block_number_response["result"])
+        self._record_head(current_block_number)
+        code = code_response["result"]
         if code == ETH_NULL_VALUE:
+            self._cache.set(non_contract_key, True)
             raise ValueError("Contract not found")
         first_block = self.binary_search_first_block(
             0, current_block_number, contract_address
         )
-        tx_receipts: list = self.get_transaction_receipts(first_block)
-        matching_receipt = [
-            receipt
-            for receipt in tx_receipts
-            if str(receipt["contractAddress"]).lower() == contract_address.lower()
-        ]
-        if len(matching_receipt) == 0:
+        with closing(self.iter_transaction_receipts(first_block)) as tx_receipts:
+            matching_receipt = next(
+                (
+                    receipt
+                    for receipt in tx_receipts
+                    if receipt.get("contractAddress")
+                    and receipt["contractAddress"].lower() == target_address
+                ),
+                None,
+            )
+        if matching_receipt is None:
             raise ValueError("Contract not found")
 
-        return matching_receipt[0]["from"], first_block
+        deployer = (matching_receipt["from"], first_block)
+        self._deployer_cache[cache_key] = deployer
+        return deployer
 
     def _get_all_asset_transfers(
         self,
@@ -156,42 +344,157 @@ class Alchemy(EVM_Node):
         from_block: Union[int, str, None] = 0,
         to_block: Union[int, str, None] = None,
         contract_addresses: Optional[list] = None,
-        category: Optional[List[str]] = [
-            "external",
-            "internal",
-            "erc20",
-            "erc721",
-            "specialnft",
-        ],
+        category: Optional[Sequence[str]] = None,
+        concurrency: Optional[int] = DEFAULT_CONCURRENCY,
     ) -> list:
         """
         NOTE: This will make a LOT of API calls if you're not careful!
 
+        The block range is split into `concurrency` shards which are paged through in parallel.
+
         params:
             from_address: Address to look for transactions from
             from_block: int (1), hex ("0x1"), or str "1"
             to_block: int (1), hex ("0x1"), or str "1"
             contract_addresses: List of contract addresses to filter by
             category: List of categories to filter by
+            concurrency: How many block ranges to page through at the same time
         returns:
             a list of asset transfers
         """
+        shards = self._split_block_range(from_block, to_block, concurrency)
+
+        def get_shard(shard: Tuple[int, int]) -> list:
+            return self._get_all_asset_transfers_in_range(
+                from_address=from_address,
+                to_address=to_address,
+                from_block=shard[0],
+                to_block=shard[1],
+                contract_addresses=contract_addresses,
+                category=category,
+            )
+
+        if len(shards) == 1:
+            shard_transfers = [get_shard(shards[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                shard_transfers = list(executor.map(get_shard, shards))
+        return self._merge_transfer_shards(shard_transfers), None
+
+    def _merge_transfer_shards(self, shard_transfers: List[list]) -> list:
+        """Joins the transfers of each shard in order, dropping any duplicate "uniqueId"s."""
         total_transfers = []
-        page_key = None
-        first_run = True
-        while page_key is not None or first_run:
-            first_run = False
-            transfers, page_key = self.get_asset_transfers(
+        seen_transfer_ids = set()
+        for transfers in shard_transfers:
+            for transfer in transfers:
+                transfer_id = transfer.get("uniqueId")
+                if transfer_id is not None:
+                    if transfer_id in seen_transfer_ids:
+                        continue
+                    seen_transfer_ids.add(transfer_id)
+                total_transfers.append(transfer)
+        return total_transfers
+
+    def _get_all_asset_transfers_in_range(
+        self,
+        from_address: Optional[str] = None,
+        to_address: Optional[str] = None,
+        from_block: Union[int, str, None] = 0,
+        to_block: Union[int, str, None] = None,
+        contract_addresses: Optional[list] = None,
+        category: Optional[Sequence[str]] = None,
+    ) -> list:
+        """Pages through every asset transfer in a single block range, one page at a time.
+
+        returns:
+            a list of asset transfers
+        """
+        return list(
+            self.iter_asset_transfers(
                 from_address=from_address,
                 to_address=to_address,
                 from_block=from_block,
                 to_block=to_block,
+                contract_addresses=contract_addresses,
+                category=category,
+            )
+        )
+
+    def iter_asset_transfers(
+        self,
+        from_address: Optional[str] = None,
+        to_address: Optional[str] = None,
+        from_block: Union[int, str, None] = 0,
+        to_block: Union[int, str, None] = None,
+        contract_addresses: Optional[list] = None,
+        category: Optional[Sequence[str]] = None,
+        prefetch: bool = False,
+    ) -> Iterator[dict]:
+        """Lazily yields every asset transfer, fetching the next page only once the current one is used up.
+        Unlike `get_asset_transfers(get_all_flag=True)`, at most one transfer is held in memory at a time
+        if ijson is installed, since each page is parsed as it streams in.
+
+        params:
+            Same as `get_asset_transfers`
+            prefetch: Fetch the next page on a background thread while the current one is being used.
+            Faster when there's work done per transfer, but each page is then held in memory whole
+        returns:
+            an iterator over the asset transfers
+        """
+        if to_block is None:
+            to_block = self._get_recent_block_number()
+        from_block_hex = to_hex(from_block)
+        to_block_hex = to_hex(to_block)
+        from_address = normalize_address(from_address) if from_address else None
+        to_address = normalize_address(to_address) if to_address else None
+
+        def page_payload(page_key: Optional[str]) -> dict:
+            return self._asset_transfers_payload(
+                from_address=from_address,
+                to_address=to_address,
+                from_block_hex=from_block_hex,
+                to_block_hex=to_block_hex,
+                max_count=1000,
                 page_key=page_key,
                 contract_addresses=contract_addresses,
                 category=category,
             )
-            total_transfers.extend(transfers)
-        return total_transfers, None
+
+        if prefetch:
+            yield from self._iter_prefetched_asset_transfers(page_payload)
+            return
+        page_key = None
+        first_run = True
+        while page_key is not None or first_run:
+            first_run = False
+            page = {"result.pageKey": None}
+            yield from self._handle_streamed_api_call(
+                page_payload(page_key),
+                "result.transfers.item",
+                endpoint="getAssetTransfers",
+                captured=page,
+            )
+            page_key = page["result.pageKey"]
+
+    def _iter_prefetched_asset_transfers(
+        self, page_payload: Callable[[Optional[str]], dict]
+    ) -> Iterator[dict]:
+        """Pages through asset transfers, requesting each next page as soon as its page key is known.
+        Page keys only come with the page before, so at most one page is ever being fetched ahead.
+        """
+
+        def get_page(page_key: Optional[str]) -> Tuple[list, Optional[str]]:
+            json_response = self._handle_api_call(
+                page_payload(page_key), endpoint="getAssetTransfers"
+            )
+            return self._parse_asset_transfers(json_response)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(get_page, None)
+            while next_page is not None:
+                transfers, page_key = next_page.result()
+                next_page = executor.submit(get_page, page_key) if page_key else None
+                yield from transfers
 
     def get_asset_transfers(
         self,
@@ -202,14 +505,9 @@ class Alchemy(EVM_Node):
         max_count: Union[int, str, None] = 1000,
         page_key: Optional[str] = None,
         contract_addresses: Optional[list] = None,
-        category: Optional[List[str]] = [
-            "external",
-            "internal",
-            "erc20",
-            "erc721",
-            "specialnft",
-        ],
+        category: Optional[Sequence[str]] = None,
         get_all_flag: Optional[bool] = False,
+        concurrency: Optional[int] = DEFAULT_CONCURRENCY,
     ) -> Tuple[list, str]:
         """
         params:
@@ -219,8 +517,10 @@ class Alchemy(EVM_Node):
             max_count: Max number of transactions to return
             page_key: A unique key to get the next page of results
             contract_addresses: A list of contract addresses to filter by (for erc20, erc721, specialnft)
-            category: A list of categories to filter by (external, internal, erc20, erc721, specialnft)
+            category: A list of categories to filter by (external, internal, erc20, erc721, specialnft).
+            Defaults to all of them
             get_all_flag: If True, will make multiple API calls to get all results
+            concurrency: If get_all_flag is True, how many block ranges to page through at the same time
 
             NOTE: If get_all_flag is true, you risk making a LOT of API calls!
 
@@ -228,11 +528,11 @@ class Alchemy(EVM_Node):
             A Tuple, index 0 is the list of transfers, index 1 is the page key or None
         """
         if to_block is None:
-            to_block = self.get_current_block_number()
-        from_block_hex = HexIntStringNumber(from_block).hex
-        to_block_hex = HexIntStringNumber(to_block).hex
-        from_address = from_address.lower() if from_address else None
-        to_address = to_address.lower() if to_address else None
+            to_block = self._get_recent_block_number()
+        from_block_hex = to_hex(from_block)
+        to_block_hex = to_hex(to_block)
+        from_address = normalize_address(from_address) if from_address else None
+        to_address = normalize_address(to_address) if to_address else None
         if get_all_flag:
             return self._get_all_asset_transfers(
                 from_address=from_address,
@@ -241,21 +541,46 @@ class Alchemy(EVM_Node):
                 to_block=to_block_hex,
                 contract_addresses=contract_addresses,
                 category=category,
+                concurrency=concurrency,
             )
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "alchemy_getAssetTransfers",
-            "params": [
+        payload = self._asset_transfers_payload(
+            from_address=from_address,
+            to_address=to_address,
+            from_block_hex=from_block_hex,
+            to_block_hex=to_block_hex,
+            max_count=max_count,
+            page_key=page_key,
+            contract_addresses=contract_addresses,
+            category=category,
+        )
+        json_response = self._handle_api_call(payload, endpoint="getAssetTransfers")
+        return self._parse_asset_transfers(json_response)
+
+    def _asset_transfers_payload(
+        self,
+        from_address: Optional[str],
+        to_address: Optional[str],
+        from_block_hex: str,
+        to_block_hex: str,
+        max_count: Union[int, str, None],
+        page_key: Optional[str],
+        contract_addresses: Optional[list],
+        category: Optional[Sequence[str]],
+    ) -> dict:
+        payload = self._rpc(
+            "alchemy_getAssetTransfers",
+            [
                 {
                     "fromBlock": from_block_hex,
                     "toBlock": to_block_hex,
-                    "category": category,
+                    "category": list(
+                        DEFAULT_TRANSFER_CATEGORIES if category is None else category
+                    ),
                     "excludeZeroValue": False,
-                    "maxCount": HexIntStringNumber(max_count).hex,
+                    "maxCount": to_hex(max_count),
                 }
             ],
-        }
+        )
         if page_key:
             payload["params"][0]["pageKey"] = page_key
         if contract_addresses:
@@ -264,8 +589,9 @@ class Alchemy(EVM_Node):
             payload["params"][0]["fromAddress"] = from_address
         if to_address:
             payload["params"][0]["toAddress"] = to_address
+        return payload
 
-        json_response = self._handle_api_call(payload, endpoint="getAssetTransfers")
+    def _parse_asset_transfers(self, json_response: dict) -> Tuple[list, str]:
         result = json_response.get("result")
         transfers = result.get("transfers", -1)
         if transfers == -1:
@@ -281,19 +607,11 @@ class Alchemy(EVM_Node):
         returns:
             block data
         """
-        if block_number_or_hash_or_tag in POSSIBLE_BLOCK_TAGS:
-            return self.get_block_by_number(block_number_or_hash_or_tag)
-        if is_hash(block_number_or_hash_or_tag):
+        if classify_block_identifier(block_number_or_hash_or_tag) == "hash":
             return self.get_block_by_hash(block_number_or_hash_or_tag)
         return self.get_block_by_number(block_number_or_hash_or_tag)
 
-    def get_block_number(self) -> int:
-        """
-        returns:
-            current block number
-        """
-        current_block: int = self.get_current_block_number()
-        return current_block
+    get_block_number = EVM_Node.get_current_block_number
 
     def get_block_with_transactions(
         self, block_hash_number_or_tag: Union[str, int]
@@ -304,61 +622,121 @@ class Alchemy(EVM_Node):
         returns:
             block data
         """
-        if block_hash_number_or_tag in POSSIBLE_BLOCK_TAGS:
-            return self.get_block_by_number(block_hash_number_or_tag, True)
-        if is_hash(block_hash_number_or_tag):
+        if classify_block_identifier(block_hash_number_or_tag) == "hash":
             return self.get_block_by_hash(block_hash_number_or_tag, True)
         return self.get_block_by_number(block_hash_number_or_tag, True)
 
-    def fee_data(self) -> dict:
-        return self.get_fee_data()
-
     def get_fee_data(self) -> dict:
         """Returns the recommended fee data to use in a transaction.
         For an EIP-1559 transaction, the maxFeePerGas and maxPriorityFeePerGas should be used.
         For legacy transactions and networks which do not support EIP-1559,
         the gasPrice should be used.
 
+        All of the values are fetched in a single batched request.
+
         Returns:
             dict: _description_
         """
-        max_fee_per_gas = self.get_max_fee_per_gas()
-        max_priority_fee_per_gas = self.get_max_priority_fee_per_gas()
-        gas_price = self.get_gas_price()
+        fee_history, max_priority_fee_per_gas, gas_price = self._get_fee_results(
+            "eth_feeHistory", "eth_maxPriorityFeePerGas", "eth_gasPrice"
+        )
+        base_fee_per_gas = to_int(fee_history["baseFeePerGas"][0])
+        max_priority_fee_per_gas = to_int(max_priority_fee_per_gas)
+        max_fee_per_gas = base_fee_per_gas + max_priority_fee_per_gas
+        gas_price = to_int(gas_price)
         return {
             "max_fee_per_gas": max_fee_per_gas,
             "max_priority_fee_per_gas": max_priority_fee_per_gas,
             "gas_price": gas_price,
         }
 
+    fee_data = get_fee_data
+
+    def _get_fee_results(self, *methods: str) -> list:
+        """Fetches the results of several of the parameterless fee RPCs in one batched request.
+
+        params:
+            methods: any of the keys of FEE_METHOD_PARAMS
+        returns:
+            the raw results, in the same order as the methods
+        """
+        payloads = [
+            self._rpc(method, FEE_METHOD_PARAMS[method], id_offset=index)
+            for index, method in enumerate(methods)
+        ]
+        return [
+            json_response.get("result")
+            for json_response in self._handle_batch_api_call(payloads)
+        ]
+
     def get_datetime_of_blocks(
-        self, blocks=None, from_block=None, to_block=None
+        self,
+        blocks=None,
+        from_block=None,
+        to_block=None,
+        batch_size: Optional[int] = DEFAULT_BATCH_SIZE,
+        concurrency: Optional[int] = DEFAULT_CONCURRENCY,
     ) -> dict:
         """
         params:
+                blocks: any iterable of block numbers as INTs, used instead of from_block/to_block
                 from_block as an INT
                 to_block as an INT
+                batch_size: how many blocks to request per HTTP call (JSON-RPC batch)
+                concurrency: how many of those HTTP calls to have in flight at the same time
         returns:
                 A dictionary, result[block] = block_date
         """
-        blocks = list(range(from_block, to_block)) if blocks is None else blocks
+        blocks = range(from_block, to_block) if blocks is None else blocks
+        result, missing_blocks = self._cached_block_datetimes(blocks)
+        if not missing_blocks:
+            return result
+        payload_batches = (
+            self._block_datetimes_payloads(block_chunk)
+            for block_chunk in chunked(missing_blocks, batch_size)
+        )
+        for json_responses in self._map_batches(payload_batches, concurrency):
+            result.update(self._parse_block_datetimes(json_responses))
+        self._cache_block_datetimes(result, missing_blocks)
+        return result
+
+    def _cached_block_datetimes(self, blocks: Iterable[int]) -> Tuple[dict, List[int]]:
+        """Looks every block up in the cache, returning the datetimes found and the blocks that weren't."""
         result = {}
+        missing_blocks = []
         for block in blocks:
-            payload = {
-                "id": self.call_id,
-                "jsonrpc": "2.0",
-                "method": "eth_getBlockByNumber",
-                "params": [hex(block), False],
-            }
-            json_response = self._handle_api_call(payload)
-            result_raw = json_response.get("result", None)
-            block = int(result_raw["number"], 16)
-            block_date = datetime.fromtimestamp(int(result_raw["timestamp"], 16))
-            result[block] = block_date
-        return result
+            result[block] = self._cache.get((self.network.name, "blockDatetime", block))
+            if result[block] is None:
+                missing_blocks.append(block)
+        return result, missing_blocks
+
+    def _cache_block_datetimes(self, result: dict, blocks: List[int]):
+        """Caches the datetimes of the blocks behind the last safe head seen.
+        Timestamps of blocks that can't be reorged never change.
+        """
+        safe_head = self._safe_head()
+        for block in blocks:
+            if block <= safe_head:
+                self._cache.set(
+                    (self.network.name, "blockDatetime", block), result[block]
+                )
 
-    def max_priority_fee_per_gas(self) -> int:
-        return self.get_max_priority_fee_per_gas()
+    def _block_datetimes_payloads(self, blocks: List[int]) -> List[dict]:
+        return [
+            self._rpc("eth_getBlockByNumber", [hex(block), False], id_offset=index)
+            for index, block in enumerate(blocks)
+        ]
+
+    def _parse_block_datetimes(self, json_responses: List[dict]) -> dict:
+        # datetime.fromtimestamp is already C-level and returns local time, which a NumPy
+        # datetime64 decode wouldn't, so a plain comprehension is as fast as this gets
+        results = [json_response["result"] for json_response in json_responses]
+        return {
+            int(result_raw["number"], 16): datetime.fromtimestamp(
+                int(result_raw["timestamp"], 16)
+            )
+            for result_raw in results
+        }
 
     def get_max_priority_fee_per_gas(self) -> int:
         """
@@ -367,15 +745,12 @@ class Alchemy(EVM_Node):
         returns:
             current max priority fee per gas in wei
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_maxPriorityFeePerGas",
-            "params": [],
-        }
+        payload = self._rpc("eth_maxPriorityFeePerGas")
         json_response = self._handle_api_call(payload)
         result = json_response.get("result", "0")
-        return HexIntStringNumber(result).int
+        return to_int(result)
+
+    max_priority_fee_per_gas = get_max_priority_fee_per_gas
 
     def get_fee_history(
         self,
@@ -389,46 +764,31 @@ class Alchemy(EVM_Node):
         returns:
             current fee history
         """
-        if newest_block in POSSIBLE_BLOCK_TAGS:
-            newest_block = self.get_block(newest_block)["number"]
-        params = (
-            [HexIntStringNumber(block_count).hex, HexIntStringNumber(newest_block).hex]
-            if not reward_percentiles
-            else [block_count, newest_block, reward_percentiles]
-        )
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_feeHistory",
-            "params": params,
-        }
+        params = [to_hex(block_count), to_block_tag(newest_block)]
+        if reward_percentiles:
+            params.append(reward_percentiles)
+        payload = self._rpc("eth_feeHistory", params)
         json_response = self._handle_api_call(payload)
         result = json_response.get("result", {})
         return result
 
-    def fee_history(
-        self,
-        block_count: int,
-        newest_block: Union[str, int],
-        reward_percentiles: int = None,
-    ) -> dict:
-        return self.get_fee_history(block_count, newest_block, reward_percentiles)
-
-    def max_fee_per_gas(self) -> int:
-        return self.get_max_fee_per_gas()
+    fee_history = get_fee_history
 
     def get_max_fee_per_gas(self) -> int:
-        base_fee_per_gas = self.get_base_fee_per_gas()
-        max_priority_fee_per_gas = self.get_max_priority_fee_per_gas()
-        return base_fee_per_gas + max_priority_fee_per_gas
+        fee_history, max_priority_fee_per_gas = self._get_fee_results(
+            "eth_feeHistory", "eth_maxPriorityFeePerGas"
+        )
+        base_fee_per_gas = to_int(fee_history["baseFeePerGas"][0])
+        return base_fee_per_gas + to_int(max_priority_fee_per_gas)
+
+    max_fee_per_gas = get_max_fee_per_gas
 
     def get_base_fee_per_gas(self) -> int:
-        fee_history = self.fee_history(1, "latest")
+        fee_history = self.get_fee_history(1, "latest")
         base_fee_per_gas = fee_history["baseFeePerGas"][0]
-        return HexIntStringNumber(base_fee_per_gas).int
+        return to_int(base_fee_per_gas)
 
-    def base_fee_per_gas(self) -> int:
-        return self.get_base_fee_per_gas()
+    base_fee_per_gas = get_base_fee_per_gas
 
     def get_token_balances(
         self,
@@ -445,11 +805,7 @@ class Alchemy(EVM_Node):
         returns:
             Dictionary of token balances
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "alchemy_getTokenBalances",
-        }
+        payload = self._rpc("alchemy_getTokenBalances")
         json_response = {}
         if isinstance(token_addresses_or_type, list):
             if len(token_addresses_or_type) > 1500:
@@ -480,14 +836,18 @@ class Alchemy(EVM_Node):
         returns:
             Dictionary of token metadata
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "alchemy_getTokenMetadata",
-            "params": [token_address],
-        }
+        cache_key = (
+            self.network.name,
+            "alchemy_getTokenMetadata",
+            normalize_address(token_address),
+        )
+        result = self._cache.get(cache_key)
+        if result is not None:
+            return result
+        payload = self._rpc("alchemy_getTokenMetadata", [token_address])
         json_response = self._handle_api_call(payload, endpoint="getTokenMetadata")
         result = json_response.get("result", {})
+        self._cache.set(cache_key, result)
         return result
 
     def send(self, method: str, parameters: list) -> dict:
@@ -501,12 +861,7 @@ class Alchemy(EVM_Node):
         """
         if not isinstance(parameters, list):
             parameters = [parameters]
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": parameters,
-        }
+        payload = self._rpc(method, parameters)
         json_response = self._handle_api_call(payload)
         result = json_response.get("result", {})
         return result
@@ -576,6 +931,37 @@ class Alchemy(EVM_Node):
         returns:
             Dictionary of NFTs
         """
+        params = self._nfts_params(
+            owner,
+            page_key,
+            page_size,
+            contract_addresses,
+            with_metadata,
+            token_uri_timeout_in_ms,
+            exclude_filters,
+            include_filters,
+            order_by,
+        )
+        json_response = self._handle_get_call(
+            "getNFTs",
+            params=params,
+            endpoint="getNFTsForOwner",
+            url=self.nft_url,
+        )
+        return json_response
+
+    def _nfts_params(
+        self,
+        owner: str,
+        page_key: Optional[str],
+        page_size: Optional[int],
+        contract_addresses: Optional[List[str]],
+        with_metadata: Optional[bool],
+        token_uri_timeout_in_ms: Union[int, None],
+        exclude_filters: Optional[List[str]],
+        include_filters: Optional[List[str]],
+        order_by: Optional[str],
+    ) -> dict:
         params = {"owner": owner}
         if page_key:
             params["pageKey"] = page_key
@@ -593,13 +979,7 @@ class Alchemy(EVM_Node):
             params["includeFilters"] = include_filters
         if order_by:
             params["orderBy"] = order_by
-        json_response = self._handle_get_call(
-            "getNFTs",
-            params=params,
-            endpoint="getNFTsForOwner",
-            url=self.nft_url,
-        )
-        return json_response
+        return params
 
     def get_owners_for_token(
         self, contract_address: str, token_id: Union[str, int]
@@ -614,7 +994,7 @@ class Alchemy(EVM_Node):
             dict: Dictionary of owners
         """
         params = {"contractAddress": contract_address}
-        params["tokenId"] = HexIntStringNumber(token_id).int
+        params["tokenId"] = str(to_int(token_id))
         json_response = self._handle_get_call(
             "getOwnersForToken",
             params=params,
@@ -652,7 +1032,7 @@ class Alchemy(EVM_Node):
         params = {
             "contractAddress": contract_address,
             "withTokenBalances": with_token_balances or False,
-            "block": HexIntStringNumber(block).str,
+            "block": str(to_int(block)),
         }
         if page_key:
             params["pageKey"] = page_key
@@ -749,9 +1129,85 @@ class Alchemy(EVM_Node):
         Returns:
             dict: Dictionary of metadata
         """
+        params = self._nft_metadata_params(
+            contract_address,
+            token_id,
+            token_type,
+            token_uri_timeout_in_ms,
+            refresh_cache,
+        )
+        json_response = self._handle_get_call(
+            "getNFTMetadata",
+            params=params,
+            endpoint="getNFTMetadata",
+            url=self.nft_url,
+        )
+        return json_response
+
+    def get_nft_metadata_batch(
+        self,
+        tokens: List[Tuple[str, Union[str, int]]],
+        token_type: Optional[str] = None,
+        token_uri_timeout_in_ms: int = 0,
+        refresh_cache: bool = False,
+    ) -> List[dict]:
+        """Like `get_nft_metadata`, but for many NFTs, with up to NFT_METADATA_BATCH_SIZE NFTs per call.
+
+        Args:
+            tokens (List[Tuple[str, Union[str, int]]]): (contract address, token ID) of each NFT
+            token_type (str, optional): Token type of every NFT, "ERC721" or "ERC1155". Defaults to None, which lets Alchemy work it out.
+            token_uri_timeout_in_ms (int, optional): Timeout in ms for the token URI. Defaults to 0.
+            refresh_cache (bool, optional): Refresh the cache. Defaults to False.
+
+        Returns:
+            List[dict]: The metadata of each NFT, in the same order as `tokens`
+        """
+        results = []
+        for token_chunk in chunked(tokens, NFT_METADATA_BATCH_SIZE):
+            body = {
+                "tokens": [
+                    self._nft_metadata_batch_token(
+                        contract_address, token_id, token_type
+                    )
+                    for contract_address, token_id in token_chunk
+                ],
+                "refreshCache": refresh_cache,
+            }
+            if token_uri_timeout_in_ms:
+                body["tokenUriTimeoutInMs"] = token_uri_timeout_in_ms
+            results.extend(
+                self._handle_rest_post_call(
+                    "getNFTMetadataBatch",
+                    body,
+                    endpoint="getNFTMetadataBatch",
+                    url=self.nft_url,
+                )
+            )
+        return results
+
+    def _nft_metadata_batch_token(
+        self,
+        contract_address: str,
+        token_id: Union[str, int],
+        token_type: Optional[str],
+    ) -> dict:
+        # Token IDs go as decimal strings: they're often too big for a JSON number
+        token = {"contractAddress": contract_address, "tokenId": str(to_int(token_id))}
+        if token_type:
+            token["tokenType"] = token_type
+        return token
+
+    def _nft_metadata_params(
+        self,
+        contract_address: str,
+        token_id: Union[str, int],
+        token_type: str,
+        token_uri_timeout_in_ms: int,
+        refresh_cache: bool,
+    ) -> dict:
         params = {
             "contractAddress": contract_address,
-            "tokenId": HexIntStringNumber(token_id).int,
+            "tokenId": str(to_int(token_id)),
         }
         if token_type:
             params["tokenType"] = token_type
@@ -759,23 +1215,27 @@ class Alchemy(EVM_Node):
             params["tokenUriTimeoutInMs"] = token_uri_timeout_in_ms
         if refresh_cache:
             params["refreshCache"] = refresh_cache
-        json_response = self._handle_get_call(
-            "getNFTMetadata",
-            params=params,
-            endpoint="getNFTMetadata",
-            url=self.nft_url,
-        )
-        return json_response
+        return params
 
-    def get_contract_metadata(self, contract_address: str) -> dict:
+    def get_contract_metadata(self, contract_address: str, max_age: float = 0) -> dict:
         """Queries NFT high-level collection/contract level information.
 
         Args:
             contract_address (str): Contract address of the NFT
+            max_age (float, optional): Seconds previously fetched metadata can be reused for. It includes
+            things that change, like the OpenSea floor price and total supply. Defaults to 0, always fetching.
 
         Returns:
             dict: Dictionary of metadata
         """
+        cache_key = (
+            self.network.name,
+            "getContractMetadata",
+            normalize_address(contract_address),
+        )
+        json_response = self._get_recent(cache_key, max_age)
+        if json_response is not None:
+            return json_response
         params = {
             "contractAddress": contract_address,
         }
@@ -785,8 +1245,41 @@ class Alchemy(EVM_Node):
             endpoint="getContractMetadata",
             url=self.nft_url,
         )
+        self._set_recent(cache_key, json_response)
         return json_response
 
+    def get_contract_metadata_batch(
+        self, contract_addresses: List[str], max_age: float = 0
+    ) -> List[dict]:
+        """Like `get_contract_metadata`, but for many contracts, with up to
+        NFT_METADATA_BATCH_SIZE contracts per call. Shares its cache with `get_contract_metadata`.
+
+        Args:
+            contract_addresses (List[str]): Contract addresses of the NFTs
+            max_age (float, optional): Seconds previously fetched metadata can be reused for. Defaults to 0,
+            always fetching.
+
+        Returns:
+            List[dict]: The metadata of each contract, in the same order as `contract_addresses`
+        """
+        cache_keys = [
+            (self.network.name, "getContractMetadata", normalize_address(address))
+            for address in contract_addresses
+        ]
+        results = [self._get_recent(cache_key, max_age) for cache_key in cache_keys]
+        missing = [index for index, result in enumerate(results) if result is None]
+        for missing_chunk in chunked(missing, NFT_METADATA_BATCH_SIZE):
+            json_response = self._handle_rest_post_call(
+                "getContractMetadataBatch",
+                {"contractAddresses": [contract_addresses[i] for i in missing_chunk]},
+                endpoint="getContractMetadataBatch",
+                url=self.nft_url,
+            )
+            for index, contract_metadata in zip(missing_chunk, json_response):
+                results[index] = contract_metadata
+                self._set_recent(cache_keys[index], contract_metadata)
+        return results
+
     def get_nfts_for_contract(
         self,
         contract_address: str,
@@ -889,11 +1382,21 @@ class Alchemy(EVM_Node):
     def is_spam_contract(self, contract_address: str) -> bool:
         """Checks if a contract is a spam contract.
 
+        The spam contract list is fetched once and kept for `spam_contracts_ttl` seconds.
+
         Returns:
             bool: True if spam contract, False otherwise
         """
-        spam_contracts = self.get_spam_contracts()
-        return contract_address in spam_contracts
+        fetched_at, spam_contracts = self._spam_contracts
+        if (
+            fetched_at is None
+            or time.monotonic() - fetched_at > self.spam_contracts_ttl
+        ):
+            spam_contracts = frozenset(
+                address.lower() for address in self.get_spam_contracts()
+            )
+            self._spam_contracts = (time.monotonic(), spam_contracts)
+        return contract_address.lower() in spam_contracts
 
     def reingest_contract(self, contract_address: str) -> dict:
         """Refreshes a contract.
@@ -945,7 +1448,7 @@ class Alchemy(EVM_Node):
         """
         params = {
             "contractAddress": contract_address,
-            "tokenId": HexIntStringNumber(token_id).hex,
+            "tokenId": to_hex(token_id),
         }
         json_response = self._handle_get_call(
             "computeRarity",
@@ -966,13 +1469,25 @@ class Alchemy(EVM_Node):
         if isinstance(contract_addresses, str):
             contract_addresses = [contract_addresses]
         contract_addresses = [contract.lower() for contract in contract_addresses]
-        nfts_for_owner = self.get_nfts_for_owner(
-            wallet_address, contract_addresses=contract_addresses, omit_metadata=True
-        )
         contract_addresses_dict = {contract: False for contract in contract_addresses}
-        for nft in nfts_for_owner["ownedNfts"]:
-            if nft["contract"]["address"].lower() in contract_addresses_dict:
-                contract_addresses_dict[nft["contract"]["address"]] = True
+        unowned = set(contract_addresses_dict)
+        page_key = None
+        # Page through the owned NFTs until every contract is found or the pages run out
+        while unowned:
+            nfts_for_owner = self.get_nfts_for_owner(
+                wallet_address,
+                page_key=page_key,
+                contract_addresses=contract_addresses,
+                omit_metadata=True,
+            )
+            for nft in nfts_for_owner["ownedNfts"]:
+                address = nft["contract"]["address"].lower()
+                if address in unowned:
+                    contract_addresses_dict[address] = True
+                    unowned.discard(address)
+            page_key = nfts_for_owner.get("pageKey")
+            if not page_key:
+                break
         return contract_addresses_dict
 
     ############################################################
@@ -1010,7 +1525,7 @@ class Alchemy(EVM_Node):
         params = [
             {
                 "tx": tx,
-                "maxBlockNumber": HexIntStringNumber(max_block_number).hex,
+                "maxBlockNumber": to_hex(max_block_number),
                 "preferences": {"fast": fast},
             }
         ]
@@ -1040,29 +1555,143 @@ class Alchemy(EVM_Node):
         transaction_hash: str,
         confirmations: Optional[int] = 1,
         timeout: Optional[int] = 60,
+        poll_interval: Optional[float] = None,
+        max_poll_interval: Optional[float] = MAX_POLL_INTERVAL,
+        use_websocket: bool = False,
     ) -> dict:
         """Waits for a transaction to be confirmed.
 
+        Polls quickly at first, then backs off by POLL_BACKOFF each round up to `max_poll_interval`.
+        With `use_websocket`, it instead subscribes to new blocks and only checks the receipt as each
+        block arrives, falling back to polling if the websocket fails.
+
+        Args:
+            transaction_hash (str): The hash of the transaction to wait for
+            confirmations (int, optional): How many confirmations to wait for. Defaults to 1.
+            timeout (int, optional): How many seconds to wait before raising a TimeoutError. Defaults to 60.
+            poll_interval (float, optional): Seconds to wait before the second poll. Defaults to about a block time of the network.
+            max_poll_interval (float, optional): The longest to ever wait between polls. Defaults to MAX_POLL_INTERVAL.
+            use_websocket (bool, optional): Listen for new blocks over a websocket instead of polling.
+            Needs the `websocket` extra. Defaults to False.
+
         Returns:
             dict: Dictionary of transaction
         """
-        receipt = self.get_transaction_receipt(transaction_hash)
-        if receipt["confirmations"] >= confirmations:
-            return receipt
-        # start a loop that will check the number of confirmatoins every 5 seconds
-        start_time = time.time()
-        while (
-            time.time() - start_time < timeout
-            and receipt["confirmations"] < confirmations
-        ):
-            time.sleep(5)
-            receipt = self.get_transaction_receipt(transaction_hash)
-            if receipt["confirmations"] >= confirmations:
+        deadline = time.monotonic() + timeout
+        if use_websocket:
+            if websocket_connect is None:
+                raise ImportError(
+                    'use_websocket needs websockets, install it with: pip install "alchemy_sdk_py[websocket]"'
+                )
+            try:
+                return self._wait_for_transaction_over_websocket(
+                    transaction_hash, confirmations, timeout, deadline
+                )
+            except TimeoutError:
+                raise
+            except (OSError, WebSocketException):
+                # Poll for whatever is left of the timeout
+                pass
+        if poll_interval is None:
+            poll_interval = POLL_INTERVALS.get(self.network.name, DEFAULT_POLL_INTERVAL)
+        interval = min(poll_interval, max_poll_interval)
+        while True:
+            receipt = self._get_pending_transaction_receipt(transaction_hash)
+            # a transaction that isn't mined yet has no receipt
+            if (
+                receipt is not None
+                and self._receipt_confirmations(receipt, confirmations) >= confirmations
+            ):
                 return receipt
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+            interval = min(interval * POLL_BACKOFF, max_poll_interval)
         raise TimeoutError(
             f"Transaction {transaction_hash} did not get {confirmations} confirmations in {timeout} seconds"
         )
 
+    def _wait_for_transaction_over_websocket(
+        self,
+        transaction_hash: str,
+        confirmations: int,
+        timeout: float,
+        deadline: float,
+    ) -> dict:
+        """Subscribes to newHeads and checks the receipt once per new block until it's mined.
+
+        Once the transaction is mined, confirmations are counted from the block numbers pushed to us,
+        so no more calls are made.
+        """
+        with websocket_connect(
+            self.ws_url, open_timeout=max(deadline - time.monotonic(), 0)
+        ) as websocket:
+            subscribe_payload = self._rpc("eth_subscribe", ["newHeads"])
+            websocket.send(json_dumps(subscribe_payload).decode())
+            subscription = json_loads(
+                websocket.recv(timeout=max(deadline - time.monotonic(), 0))
+            )
+            if subscription.get("error") is not None:
+                raise ConnectionError(
+                    f"Could not subscribe to newHeads with payload {subscribe_payload}:\n >>> Response with Error: {subscription}"
+                )
+            receipt = self._get_pending_transaction_receipt(transaction_hash)
+            head = None
+            while True:
+                if receipt is not None:
+                    if head is None:
+                        receipt_confirmations = self._receipt_confirmations(
+                            receipt, confirmations
+                        )
+                    else:
+                        receipt_confirmations = (
+                            head - to_int(receipt["blockNumber"]) + 1
+                        )
+                    if receipt_confirmations >= confirmations:
+                        return receipt
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    message = json_loads(websocket.recv(timeout=remaining))
+                except TimeoutError:
+                    break
+                if "params" not in message:
+                    continue
+                head = to_int(message["params"]["result"]["number"])
+                if receipt is None:
+                    receipt = self._get_pending_transaction_receipt(transaction_hash)
+        raise TimeoutError(
+            f"Transaction {transaction_hash} did not get {confirmations} confirmations in {timeout} seconds"
+        )
+
+    def _receipt_confirmations(self, receipt: dict, confirmations: int) -> int:
+        """Counts the confirmations of a mined transaction, only asking for the head block if more than one is needed."""
+        if "confirmations" in receipt:
+            return receipt["confirmations"]
+        if confirmations <= 1:
+            return 1
+        return self.get_current_block_number() - to_int(receipt["blockNumber"]) + 1
+
+    def _get_pending_transaction_receipt(self, transaction_hash: str) -> Optional[dict]:
+        """Like `get_transaction_receipt`, but returns None instead of raising if the transaction isn't mined yet."""
+        payload = self._rpc("eth_getTransactionReceipt", [transaction_hash])
+        response = self._post(
+            self.base_url,
+            json_dumps(payload),
+            self._method_headers(None),
+            f"payload {payload}",
+        )
+        json_response = json_loads(response.content)
+        self.call_id = self.call_id + 1
+        if json_response.get("result", None) is None and "error" not in json_response:
+            return None
+        self._check_json_response(
+            json_response, response.status_code, response.content, payload
+        )
+        return json_response["result"]
+
     ############################################################
     ################ Settings Methods ##########################
     ############################################################
@@ -1077,6 +1706,8 @@ class Alchemy(EVM_Node):
         if not isinstance(api_key, str):
             raise ValueError(NO_API_KEY_ERROR)
         self.api_key = api_key
+        self.base_url = f"{self.base_url_without_key}{self.api_key}"
+        self._set_urls()
 
     def set_network(self, network: str):
         """
@@ -1086,9 +1717,12 @@ class Alchemy(EVM_Node):
             None
         """
         self.network = Network(network)
-        url_network_name = self.network.name.replace("_", "-")
-        self.base_url_without_key = f"https://{url_network_name}.g.alchemy.com/v2/"
+        self.url_network_name, self.base_url_without_key = get_network_urls(
+            self.network.name
+        )
         self.base_url = f"{self.base_url_without_key}{self.api_key}"
+        self._set_urls()
+        self._spam_contracts = (None, frozenset())
 
     def set_settings(self, key: Optional[str] = None, network: Optional[str] = None):
         """
@@ -1124,24 +1758,52 @@ class Alchemy(EVM_Node):
         returns:
             Dictionary of the response
         """
-        url = self.base_url if url is None else url
-        url = f"{url}/{rest_endpoint}"
-        headers = HEADERS
-        if endpoint is not None:
-            headers["Alchemy-Python-Sdk-Method"] = endpoint
-        response = requests.get(url, params=params, headers=headers, proxies=self.proxy)
-        if response.status_code != 200:
-            retries_here = 0
-            while retries_here < self.retries and response.status_code != 200:
-                retries_here = retries_here + 1
-                response = requests.post(
-                    url, params=params, headers=headers, proxies=self.proxy
-                )
-            if response.status_code != 200:
+        url = self._rest_url(self.base_url if url is None else url, rest_endpoint)
+        key = self._coalesce_key(url, params)
+        return self._coalesce(key, self._send_get_call, url, params, endpoint)
+
+    def _handle_rest_post_call(
+        self,
+        rest_endpoint: str,
+        body: dict,
+        endpoint: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> Any:
+        """Handles a POST call with a JSON body to a REST endpoint, ie: the NFT API batch endpoints.
+
+        params:
+            rest_endpoint: REST endpoint to call
+            body: Dictionary to send as the JSON body
+            endpoint: Optional endpoint to pass to the backend
+            url: Optional URL to call
+        returns:
+            The parsed response
+        """
+        url = self._rest_url(self.base_url if url is None else url, rest_endpoint)
+        response = self._post(
+            url, json_dumps(body), self._method_headers(endpoint), f"body {body}"
+        )
+        json_response = json_loads(response.content)
+        if isinstance(json_response, dict):
+            if json_response.get("error", None) is not None:
                 raise ConnectionError(
-                    f"Status {response.status_code} with params {params}:\n >>> Response with Error: {response.text}"
+                    f"Status {response.status_code} with body {body}:\n >>> Response with Error: {response.text}"
                 )
-        json_response = response.json()
+        self.call_id = self.call_id + 1
+        return json_response
+
+    def _send_get_call(
+        self, url: str, params: Optional[dict], endpoint: Optional[str]
+    ) -> dict:
+        headers = self._method_headers(endpoint)
+        response = self._session.get(
+            url, params=params, headers=headers, proxies=self.proxy
+        )
+        if response.status_code != 200:
+            raise ConnectionError(
+                f"Status {response.status_code} with params {params}:\n >>> Response with Error: {response.text}"
+            )
+        json_response = json_loads(response.content)
         if isinstance(json_response, dict):
             if json_response.get("error", None) is not None:
                 raise ConnectionError(
@@ -0,0 +1,597 @@
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional, Sequence, Tuple, Union
+
+from .alchemy import Alchemy
+from .evm_node import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    HEAD_CACHE_TTL,
+    HEADERS,
+    MAX_RETRY_BACKOFF,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_JITTER,
+    RETRY_STATUSES,
+)
+from .networks import Network
+from .utils import (
+    BloomFilter,
+    chunked,
+    classify_block_identifier,
+    json_dumps,
+    json_loads,
+    normalize_address,
+    to_block_tag,
+    to_hex,
+    to_int,
+)
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp is only needed for AsyncAlchemy
+    aiohttp = None
+
+DEFAULT_CONNECTION_LIMIT = 100
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+DEFAULT_MAX_CONCURRENCY = 25
+DEFAULT_RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BACKOFF_SECONDS = 0.5
+MAX_RATE_LIMIT_BACKOFF_SECONDS = 8
+
+
+class AsyncAlchemy(Alchemy):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        key: Optional[str] = None,
+        network: Optional[Network] = "eth_mainnet",
+        retries: Optional[int] = 0,
+        proxy: Optional[dict] = None,
+        url: Optional[str] = None,
+        known_contracts: Optional[BloomFilter] = None,
+        base_backoff: float = RETRY_BACKOFF_FACTOR,
+        max_backoff: float = MAX_RETRY_BACKOFF,
+        jitter: float = RETRY_JITTER,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        """An asyncio version of the Alchemy class. Requests go out over a single pooled aiohttp session,
+        so many of them can be in flight at once. Every synchronous method is still available, and the
+        async versions are prefixed with an "a", ie: `await alchemy.aget_current_block_number()`.
+
+        Use it as an async context manager, or call `await alchemy.aclose()` when you're done:
+
+            async with AsyncAlchemy() as alchemy:
+                block_number = await alchemy.aget_current_block_number()
+
+        Args:
+            Same as the Alchemy class, check alchemy.py and evm_node.py for more details.
+            max_concurrency (int, optional): The most HTTP requests to have in flight at once, so large fan-outs
+            stay under Alchemy's compute unit rate limit. Defaults to 25.
+
+        Raises:
+            ImportError: If aiohttp isn't installed
+            ValueError: If you give it a bad network or API key it'll error
+        """
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncAlchemy needs aiohttp, install it with: pip install "alchemy_sdk_py[async]"'
+            )
+        super().__init__(
+            api_key=api_key,
+            key=key,
+            network=network,
+            retries=retries,
+            proxy=proxy,
+            url=url,
+            base_backoff=base_backoff,
+            max_backoff=max_backoff,
+            jitter=jitter,
+            known_contracts=known_contracts,
+        )
+        self.max_concurrency = max_concurrency
+        self._async_session = None
+        self._semaphore = None
+
+    async def __aenter__(self) -> "AsyncAlchemy":
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes the aiohttp session, the sync session, and their pooled connections."""
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+        self.close()
+
+    ############################################################
+    ################ Async Alchemy SDK Methods #################
+    ############################################################
+
+    async def aget_current_block_number(self, max_age: float = 0) -> int:
+        """Async version of `get_current_block_number`"""
+        if max_age > 0:
+            return await self._aget_recent_block_number(max_age)
+        payload = self._rpc("eth_blockNumber")
+        json_response = await self._ahandle_api_call(payload)
+        result = int(json_response.get("result"), 16)
+        self._record_head(result)
+        return result
+
+    async def _aget_recent_block_number(self, max_age: float = HEAD_CACHE_TTL) -> int:
+        """Async version of `_get_recent_block_number`"""
+        fetched_at, head = self._heads.get(self.network.name, (None, None))
+        if head is None or time.monotonic() - fetched_at > max_age:
+            return await self.aget_current_block_number()
+        return head
+
+    async def aget_max_priority_fee_per_gas(self) -> int:
+        """Async version of `get_max_priority_fee_per_gas`"""
+        payload = self._rpc("eth_maxPriorityFeePerGas")
+        json_response = await self._ahandle_api_call(payload)
+        return to_int(json_response.get("result", "0"))
+
+    async def aget_block(
+        self,
+        block_number_or_hash_or_tag: Union[str, int],
+        full_transaction_objects: bool = False,
+    ) -> dict:
+        """Async version of `get_block`. Shares the block cache with the sync methods."""
+        block_id = to_block_tag(block_number_or_hash_or_tag)
+        kind = classify_block_identifier(block_id)
+        if kind == "hash":
+            method, block_id = "eth_getBlockByHash", block_id.lower()
+        else:
+            method = "eth_getBlockByNumber"
+        cache_key = (
+            self.network.name,
+            method,
+            block_id,
+            bool(full_transaction_objects),
+        )
+        if kind != "tag":
+            block = self._cache.get(cache_key)
+            if block is not None:
+                return block
+        payload = self._rpc(method, [block_id, full_transaction_objects])
+        json_response = await self._ahandle_api_call(payload)
+        block = json_response.get("result", {})
+        # Same rule as get_block_by_number: numbered blocks are only cached once they can't be reorged
+        if kind == "hash" or (kind != "tag" and to_int(block_id) <= self._safe_head()):
+            self._cache.set(cache_key, block)
+        return block
+
+    async def aget_transaction_receipt(self, transaction_hash: str) -> dict:
+        """Async version of `get_transaction_receipt`"""
+        if not isinstance(transaction_hash, str):
+            raise TypeError("transaction_hash must be a string")
+        params = [transaction_hash]
+        cache_key = self._rpc_cache_key("eth_getTransactionReceipt", params)
+        receipt = self._cache.get(cache_key)
+        if receipt is not None:
+            return receipt
+        payload = self._rpc("eth_getTransactionReceipt", params)
+        json_response = await self._ahandle_api_call(payload)
+        receipt = json_response.get("result", {})
+        if receipt and self._is_final_result(receipt):
+            self._cache.set(cache_key, receipt)
+        return receipt
+
+    async def aget_transaction_receipts(
+        self, block_number_or_hash: Union[str, int]
+    ) -> list:
+        """Async version of `get_transaction_receipts`"""
+        payload = self._transaction_receipts_payload(block_number_or_hash)
+        json_response = await self._ahandle_api_call(
+            payload, endpoint="getTransactionReceipts"
+        )
+        return json_response.get("result").get("receipts")
+
+    async def aget_asset_transfers(
+        self,
+        from_address: Optional[str] = None,
+        to_address: Optional[str] = None,
+        from_block: Union[int, str, None] = 0,
+        to_block: Union[int, str, None] = None,
+        max_count: Union[int, str, None] = 1000,
+        page_key: Optional[str] = None,
+        contract_addresses: Optional[list] = None,
+        category: Optional[Sequence[str]] = None,
+        get_all_flag: Optional[bool] = False,
+        concurrency: Optional[int] = DEFAULT_CONCURRENCY,
+    ) -> Tuple[list, str]:
+        """Async version of `get_asset_transfers`. With `get_all_flag`, the block range is split into
+        `concurrency` shards which are paged through concurrently, and the transfers come back in the same
+        order as the sync client's.
+
+        NOTE: Every shard costs at least one getAssetTransfers call (and its compute units), even if its
+        part of the range is empty, so a lower `concurrency` is cheaper for sparse ranges.
+        """
+        if to_block is None:
+            to_block = await self._aget_recent_block_number()
+        from_block_hex = to_hex(from_block)
+        to_block_hex = to_hex(to_block)
+        from_address = normalize_address(from_address) if from_address else None
+        to_address = normalize_address(to_address) if to_address else None
+        if get_all_flag:
+            shards = self._split_block_range(from_block_hex, to_block_hex, concurrency)
+            shard_transfers = await asyncio.gather(
+                *(
+                    self._aget_all_asset_transfers_in_range(
+                        from_address=from_address,
+                        to_address=to_address,
+                        from_block_hex=hex(shard_from),
+                        to_block_hex=hex(shard_to),
+                        contract_addresses=contract_addresses,
+                        category=category,
+                    )
+                    for shard_from, shard_to in shards
+                )
+            )
+            return self._merge_transfer_shards(shard_transfers), None
+        payload = self._asset_transfers_payload(
+            from_address=from_address,
+            to_address=to_address,
+            from_block_hex=from_block_hex,
+            to_block_hex=to_block_hex,
+            max_count=max_count,
+            page_key=page_key,
+            contract_addresses=contract_addresses,
+            category=category,
+        )
+        json_response = await self._ahandle_api_call(
+            payload, endpoint="getAssetTransfers"
+        )
+        return self._parse_asset_transfers(json_response)
+
+    async def _aget_all_asset_transfers_in_range(
+        self,
+        from_address: Optional[str],
+        to_address: Optional[str],
+        from_block_hex: str,
+        to_block_hex: str,
+        contract_addresses: Optional[list],
+        category: Optional[Sequence[str]],
+    ) -> list:
+        total_transfers = []
+        page_key = None
+        first_run = True
+        while page_key is not None or first_run:
+            first_run = False
+            payload = self._asset_transfers_payload(
+                from_address=from_address,
+                to_address=to_address,
+                from_block_hex=from_block_hex,
+                to_block_hex=to_block_hex,
+                max_count=1000,
+                page_key=page_key,
+                contract_addresses=contract_addresses,
+                category=category,
+            )
+            json_response = await self._ahandle_api_call(
+                payload, endpoint="getAssetTransfers"
+            )
+            transfers, page_key = self._parse_asset_transfers(json_response)
+            total_transfers.extend(transfers)
+        return total_transfers
+
+    async def aget_datetime_of_blocks(
+        self,
+        blocks: Optional[List[int]] = None,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: Optional[int] = DEFAULT_CONCURRENCY,
+    ) -> dict:
+        """Async version of `get_datetime_of_blocks`. Up to `concurrency` batches are in flight at the
+        same time (and never more than `max_concurrency` requests overall), and the datetimes of final
+        blocks are cached alongside the sync client's.
+        """
+        blocks = range(from_block, to_block) if blocks is None else blocks
+        result, missing_blocks = self._cached_block_datetimes(blocks)
+        if not missing_blocks:
+            return result
+        batches = []
+        for block_chunk in chunked(missing_blocks, batch_size):
+            batches.append(self._block_datetimes_payloads(block_chunk))
+            self.call_id = self.call_id + len(batches[-1])
+        limit = asyncio.Semaphore(max(1, concurrency or 1))
+
+        async def send_batch(payloads: List[dict]) -> List[dict]:
+            async with limit:
+                return await self._ahandle_batch_api_call(payloads)
+
+        json_responses = await asyncio.gather(
+            *(send_batch(payloads) for payloads in batches)
+        )
+        for batch_responses in json_responses:
+            result.update(self._parse_block_datetimes(batch_responses))
+        self._cache_block_datetimes(result, missing_blocks)
+        return result
+
+    async def asend(self, method: str, parameters: list) -> dict:
+        """Async version of `send`"""
+        if not isinstance(parameters, list):
+            parameters = [parameters]
+        payload = self._rpc(method, parameters)
+        json_response = await self._ahandle_api_call(payload)
+        return json_response.get("result", {})
+
+    ############################################################
+    ################ Async NFT Methods #########################
+    ############################################################
+
+    async def aget_nfts(
+        self,
+        owner: str,
+        page_key: Optional[str] = None,
+        page_size: Optional[int] = 100,
+        contract_addresses: Optional[List[str]] = None,
+        with_metadata: Optional[bool] = False,
+        token_uri_timeout_in_ms: Union[int, None] = None,
+        exclude_filters: Optional[List[str]] = None,
+        include_filters: Optional[List[str]] = None,
+        order_by: Optional[str] = None,
+    ) -> dict:
+        """Async version of `get_nfts`"""
+        params = self._nfts_params(
+            owner,
+            page_key,
+            page_size,
+            contract_addresses,
+            with_metadata,
+            token_uri_timeout_in_ms,
+            exclude_filters,
+            include_filters,
+            order_by,
+        )
+        return await self._ahandle_get_call(
+            "getNFTs", params=params, endpoint="getNFTsForOwner", url=self.nft_url
+        )
+
+    async def aiter_nft_pages(
+        self,
+        owner: str,
+        page_size: Optional[int] = 100,
+        contract_addresses: Optional[List[str]] = None,
+        with_metadata: Optional[bool] = False,
+        token_uri_timeout_in_ms: Union[int, None] = None,
+        exclude_filters: Optional[List[str]] = None,
+        include_filters: Optional[List[str]] = None,
+        order_by: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """Yields every page of `aget_nfts` for an owner, following the page keys.
+
+        async for page in alchemy.aiter_nft_pages(owner):
+            print(page["ownedNfts"])
+        """
+        page_key = None
+        first_run = True
+        while page_key is not None or first_run:
+            first_run = False
+            page = await self.aget_nfts(
+                owner,
+                page_key,
+                page_size,
+                contract_addresses,
+                with_metadata,
+                token_uri_timeout_in_ms,
+                exclude_filters,
+                include_filters,
+                order_by,
+            )
+            page_key = page.get("pageKey")
+            yield page
+
+    async def aget_owners_for_token(
+        self, contract_address: str, token_id: Union[str, int]
+    ) -> dict:
+        """Async version of `get_owners_for_token`"""
+        params = {"contractAddress": contract_address, "tokenId": str(to_int(token_id))}
+        return await self._ahandle_get_call(
+            "getOwnersForToken",
+            params=params,
+            endpoint="getOwnersForToken",
+            url=self.nft_url,
+        )
+
+    async def aget_nft_metadata(
+        self,
+        contract_address: str,
+        token_id: Union[str, int],
+        token_type: str = "ERC721",
+        token_uri_timeout_in_ms: int = 0,
+        refresh_cache: bool = False,
+    ) -> dict:
+        """Async version of `get_nft_metadata`"""
+        params = self._nft_metadata_params(
+            contract_address,
+            token_id,
+            token_type,
+            token_uri_timeout_in_ms,
+            refresh_cache,
+        )
+        return await self._ahandle_get_call(
+            "getNFTMetadata",
+            params=params,
+            endpoint="getNFTMetadata",
+            url=self.nft_url,
+        )
+
+    async def aget_contract_metadata(
+        self, contract_address: str, max_age: float = 0
+    ) -> dict:
+        """Async version of `get_contract_metadata`, sharing its cache"""
+        cache_key = (
+            self.network.name,
+            "getContractMetadata",
+            normalize_address(contract_address),
+        )
+        json_response = self._get_recent(cache_key, max_age)
+        if json_response is not None:
+            return json_response
+        json_response = await self._ahandle_get_call(
+            "getContractMetadata",
+            params={"contractAddress": contract_address},
+            endpoint="getContractMetadata",
+            url=self.nft_url,
+        )
+        self._set_recent(cache_key, json_response)
+        return json_response
+
+    ############################################################
+    ################ Internal/Raw Methods ######################
+    ############################################################
+
+    async def _ahandle_api_call(
+        self,
+        payload: dict,
+        endpoint: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> dict:
+        """Async version of `_handle_api_call`"""
+        url = self.base_url if url is None else url
+        headers = self._method_headers(endpoint)
+        self.call_id = self.call_id + 1
+        data = json_dumps(payload)
+        retries = self.retries or 0
+        for attempt in range(retries + 1):
+            status_code, content, json_response = await self._apost(
+                url, data, headers, f"payload {payload}"
+            )
+            if attempt == retries or not self._is_rate_limited(json_response):
+                break
+            await asyncio.sleep(self._retry_backoff(attempt))
+        self._check_json_response(json_response, status_code, content, payload)
+        return json_response
+
+    async def _ahandle_batch_api_call(
+        self,
+        payloads: List[dict],
+        endpoint: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> List[dict]:
+        """Async version of `_handle_batch_api_call`"""
+        if len(payloads) == 0:
+            return []
+        url = self.base_url if url is None else url
+        headers = self._method_headers(endpoint)
+        status_code, content, json_responses = await self._apost(
+            url, json_dumps(payloads), headers, f"a batch of {len(payloads)} payloads"
+        )
+        return self._order_batch_responses(
+            payloads, json_responses, status_code, content
+        )
+
+    async def _ahandle_get_call(
+        self,
+        rest_endpoint: str,
+        params: Optional[dict] = None,
+        endpoint: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> dict:
+        """Async version of `_handle_get_call`"""
+        url = self.base_url if url is None else url
+        status_code, content, json_response = await self._arequest(
+            "GET",
+            self._rest_url(url, rest_endpoint),
+            self._method_headers(endpoint),
+            f"params {params}",
+            params=_query_params(params),
+        )
+        if isinstance(json_response, dict):
+            if json_response.get("error", None) is not None:
+                raise ConnectionError(
+                    f"Status {status_code} with params {params}:\n >>> Response with Error: {content.decode(errors='replace')}"
+                )
+        self.call_id = self.call_id + 1
+        return json_response
+
+    async def _apost(
+        self, url: str, data: bytes, headers: Optional[dict], description: str
+    ) -> Tuple[int, bytes, Union[dict, list]]:
+        """Async version of `_post`"""
+        return await self._arequest("POST", url, headers, description, data=data)
+
+    async def _arequest(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict],
+        description: str,
+        data: Optional[bytes] = None,
+        params: Optional[list] = None,
+    ) -> Tuple[int, bytes, Union[dict, list]]:
+        """Sends a request over the aiohttp session, retrying up to `self.retries` times on a server error.
+        At most `self.max_concurrency` requests are in flight at once, and rate limited (429)
+        responses are retried with exponential backoff, honoring any Retry-After header.
+
+        returns: the status code, the raw body and the parsed JSON of the response
+        """
+        session = self._get_async_session()
+        proxy = self.proxy.get("https") or self.proxy.get("http")
+        retries_here = 0
+        rate_limit_retries = 0
+        while True:
+            async with self._semaphore:
+                async with session.request(
+                    method, url, data=data, params=params, headers=headers, proxy=proxy
+                ) as response:
+                    status_code = response.status
+                    content = await response.read()
+                    retry_after = response.headers.get("Retry-After")
+            if status_code == 429 and rate_limit_retries < DEFAULT_RATE_LIMIT_RETRIES:
+                # Sleep outside of the semaphore so other requests can use the slot
+                await asyncio.sleep(
+                    _rate_limit_backoff(rate_limit_retries, retry_after)
+                )
+                rate_limit_retries = rate_limit_retries + 1
+                continue
+            if status_code not in RETRY_STATUSES or retries_here >= (self.retries or 0):
+                break
+            await asyncio.sleep(self._retry_backoff(retries_here))
+            retries_here = retries_here + 1
+        if status_code != 200:
+            text = content.decode(errors="replace")
+            raise ConnectionError(
+                f'Status {status_code} when querying "{self.base_url_without_key}<REDACTED_API_KEY>/" with {description}:\n >>> Response with Error: {text}'
+            )
+        return status_code, content, json_loads(content)
+
+    def _get_async_session(self) -> "aiohttp.ClientSession":
+        """Lazily creates the aiohttp session, since it has to be made inside a running event loop."""
+        if self._async_session is None or self._async_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=DEFAULT_CONNECTION_LIMIT,
+                keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+            )
+            self._async_session = aiohttp.ClientSession(
+                connector=connector, headers=HEADERS
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._async_session
+
+
+def _query_params(params: Optional[dict]) -> Optional[list]:
+    """Turns a params dict into query pairs the way requests does, since aiohttp only takes str/int/float
+    values. Lists become repeated keys, ie: contractAddresses=0x1&contractAddresses=0x2
+    """
+    if params is None:
+        return None
+    query = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for single in values:
+            query.append((key, single if isinstance(single, str) else str(single)))
+    return query
+
+
+def _rate_limit_backoff(attempt: int, retry_after: Optional[str]) -> float:
+    """How long to wait before retrying a rate limited request, in seconds."""
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), MAX_RATE_LIMIT_BACKOFF_SECONDS)
+        except ValueError:
+            pass
+    return min(RATE_LIMIT_BACKOFF_SECONDS * 2**attempt, MAX_RATE_LIMIT_BACKOFF_SECONDS)
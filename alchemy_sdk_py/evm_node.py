@@ -1,17 +1,70 @@
+import copy
+import json
 import os
-from typing import List, Optional, Union
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .errors import NO_API_KEY_ERROR
-from .networks import Network
-from .utils import HexIntStringNumber
+from .networks import Network, get_network_urls
+from .utils import (
+    POSSIBLE_BLOCK_TAGS,
+    LRUCache,
+    json_dumps,
+    json_loads,
+    normalize_address,
+    to_block_tag,
+    to_hex,
+    to_int,
+)
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is an optional speedup
+    ijson = None
 
 load_dotenv()
 
+JSONRPC_VERSION = "2.0"
+# accept-encoding is left to requests/aiohttp: they ask for gzip, and for br too whenever brotli is installed
 HEADERS = {"accept": "application/json", "content-type": "application/json"}
-POSSIBLE_BLOCK_TAGS = ["latest", "earliest", "pending", "safe", "finalized"]
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_CONCURRENCY = 8
+DEFAULT_CACHE_SIZE = 4096
+RECENT_CACHE_SIZE = 256
+REORG_SAFE_DEPTH = 64
+HEAD_CACHE_TTL = 2.0
+DEFAULT_POOL_SIZE = 32
+DEFAULT_POOL_MAXSIZE = 128
+RETRY_BACKOFF_FACTOR = 0.2
+MAX_RETRY_BACKOFF = 8.0
+RETRY_JITTER = 0.1
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+SCALAR_EVENTS = frozenset(("null", "boolean", "number", "string"))
+# JSON-RPC error codes meaning the request was rate limited, sent back with a 200 status
+RATE_LIMIT_ERROR_CODES = frozenset((429, -32005))
+# What eth_getLogs errors say when a range has too many logs for one response
+LOG_RESPONSE_TOO_LARGE_ERRORS = ("response size exceeded", "query returned more than")
 
 
 class EVM_Node:
@@ -23,6 +76,9 @@ class EVM_Node:
         retries: Optional[int] = 0,
         proxy: Optional[dict] = None,
         url: Optional[str] = None,
+        base_backoff: float = RETRY_BACKOFF_FACTOR,
+        max_backoff: float = MAX_RETRY_BACKOFF,
+        jitter: float = RETRY_JITTER,
     ):
         """A python class to interact with the Alchemy API. This class is used to interact with the EVM JSON-RPC API.
         We see most of the typical EVM JSON-RPC endpoints here. For more information on the EVM JSON-RPC API, see
@@ -35,6 +91,13 @@ class EVM_Node:
             retries (Optional[int], optional): The number of times to retry a request. Defaults to 0.
             proxy (Optional[dict], optional): A proxy to use for requests. Defaults to None.
             url (Optional[str], optional): A custom url to use for requests. Defaults to None.
+            base_backoff (float, optional): Seconds to wait before the first retry, doubled on each retry after. Defaults to 0.2.
+            max_backoff (float, optional): The longest to ever wait between retries. Defaults to 8.
+            jitter (float, optional): Up to this many random seconds are added to each wait, so many clients
+            don't all retry at the same moment. Defaults to 0.1.
+
+            Only rate limits (429), server errors (500, 502, 503, 504) and connection errors are retried,
+            and a Retry-After header on a 429 or 503 is honored. Setting `retries` later applies to the next request.
 
         Raises:
             ValueError: If you give it a bad network or API key it'll error
@@ -47,14 +110,37 @@ class EVM_Node:
             raise ValueError(NO_API_KEY_ERROR)
         self.api_key = api_key
         self.network = Network(network)
-        self.url_network_name = self.network.name.replace("_", "-")
-        self.base_url_without_key = f"https://{self.url_network_name}.g.alchemy.com/v2/"
+        self.url_network_name, self.base_url_without_key = get_network_urls(
+            self.network.name
+        )
         self.base_url = (
             f"{self.base_url_without_key}{self.api_key}" if url is None else url
         )
-        self.retries = retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
         self.proxy = proxy or {}
         self.call_id = 0
+        # One session for every request, so TCP/TLS connections are kept alive and reused.
+        # The adapter also does the retrying, with exponential backoff between attempts
+        self._session = requests.Session()
+        self._adapter = HTTPAdapter(
+            pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=DEFAULT_POOL_MAXSIZE
+        )
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+        self._session.headers.update(HEADERS)
+        self.retries = retries
+        # Results that can never change (code/blocks at a given block number or hash)
+        # Both copy what goes in and out, so a caller changing a block or receipt can't change the cached one
+        self._cache = LRUCache(DEFAULT_CACHE_SIZE, copy_values=True)
+        # Results that change over time (balances, gas prices), kept apart so they can't evict the above
+        self._recent = LRUCache(RECENT_CACHE_SIZE, copy_values=True)
+        # network name -> (time.monotonic() when it was fetched, head block number)
+        self._heads = {}
+        # Calls currently being made, so identical concurrent calls can share them
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
 
     @property
     def key(self) -> str:
@@ -64,6 +150,47 @@ class EVM_Node:
         """
         return self.api_key
 
+    @property
+    def retries(self) -> Optional[int]:
+        """The number of times to retry a request."""
+        return self._retries
+
+    @retries.setter
+    def retries(self, retries: Optional[int]):
+        self._retries = retries
+        # Only failed connections and retryable statuses are retried. A read error can mean the
+        # request got through, and resending ie: eth_sendRawTransaction isn't safe
+        self._adapter.max_retries = _JitteredRetry(
+            total=retries or 0,
+            read=0,
+            backoff_factor=self.base_backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,
+            raise_on_status=False,
+            max_backoff=self.max_backoff,
+            jitter=self.jitter,
+        )
+
+    def clear_cache(self):
+        """Drops every cached result, ie: contract code, historical blocks and token/contract metadata."""
+        self._cache.clear()
+        self._recent.clear()
+
+    def _retry_backoff(self, attempt: int) -> float:
+        """Seconds to wait before retry number `attempt` (from 0), for retries made outside of urllib3."""
+        backoff = min(self.max_backoff, self.base_backoff * 2**attempt)
+        return backoff + random.uniform(0, self.jitter)
+
+    def close(self):
+        """Closes the HTTP session and its pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "EVM_Node":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     ############################################################
     ################ ETH JSON-RPC Methods ######################
     ############################################################
@@ -94,22 +221,20 @@ class EVM_Node:
             str: The result of the call
         """
         tag = tag.lower() if isinstance(tag, str) else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_call",
-            "params": [
+        payload = self._rpc(
+            "eth_call",
+            [
                 {
                     "from": from_address,
                     "to": to_address,
-                    "gas": HexIntStringNumber(gas).hex,
-                    "gasPrice": HexIntStringNumber(gas_price).hex,
-                    "value": HexIntStringNumber(value).hex,
+                    "gas": to_hex(gas),
+                    "gasPrice": to_hex(gas_price),
+                    "value": to_hex(value),
                     "data": data,
                 },
                 tag,
             ],
-        }
+        )
         json_response = self._handle_api_call(payload)
         return json_response.get("result")
 
@@ -123,63 +248,90 @@ class EVM_Node:
         data: Optional[str] = "0x0",
         tag: Union[str, dict, None] = "latest",
     ) -> str:
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_estimateGas",
-            "params": [
+        payload = self._rpc(
+            "eth_estimateGas",
+            [
                 {
                     "from": from_address,
                     "to": to_address,
-                    "gas": HexIntStringNumber(gas).hex,
-                    "gasPrice": HexIntStringNumber(gas_price).hex,
-                    "value": HexIntStringNumber(value).hex,
+                    "gas": to_hex(gas),
+                    "gasPrice": to_hex(gas_price),
+                    "value": to_hex(value),
                     "data": data,
                 },
                 tag.lower(),
             ],
-        }
+        )
         json_response = self._handle_api_call(payload)
         return json_response.get("result")
 
-    def get_current_block_number(self) -> int:
+    def get_current_block_number(self, max_age: float = 0) -> int:
         """Returns the current block number
         params:
-            None
+            max_age: Seconds a previously fetched block number can be reused for, ie: 2 to skip the call in
+            a tight loop. Defaults to 0, always fetching a fresh one.
         returns:
             the current max block (INT)
         """
-        payload = {"id": self.call_id, "jsonrpc": "2.0", "method": "eth_blockNumber"}
+        if max_age > 0:
+            return self._get_recent_block_number(max_age)
+        payload = self._rpc("eth_blockNumber")
         json_response = self._handle_api_call(payload)
         result = int(json_response.get("result"), 16)
+        self._record_head(result)
         return result
 
     def block_number(self) -> int:
         return self.get_current_block_number()
 
+    def _record_head(self, block_number: int):
+        """Remembers a freshly fetched head block number, for `max_age` reuse and the finality checks."""
+        self._heads[self.network.name] = (time.monotonic(), block_number)
+
+    def _is_final_block(self, block_number: int) -> bool:
+        """Whether a block is at least REORG_SAFE_DEPTH blocks behind the last head seen, so it's safe to cache.
+        Never asks for the head: an old head only makes this more cautious, and with none seen yet nothing is final.
+        """
+        return block_number <= self._safe_head()
+
+    def _is_final_result(self, result: dict) -> bool:
+        """Whether a transaction or receipt was mined in a block that can no longer be reorged away."""
+        block_number = result.get("blockNumber")
+        return block_number is not None and self._is_final_block(to_int(block_number))
+
+    def _safe_head(self) -> int:
+        """The newest block at least REORG_SAFE_DEPTH behind the last head seen, or -1 if none was seen yet."""
+        _, head = self._heads.get(self.network.name, (None, None))
+        return -1 if head is None else head - REORG_SAFE_DEPTH
+
+    def _get_recent_block_number(self, max_age: float = HEAD_CACHE_TTL) -> int:
+        """The current block number, reusing the last one fetched if it's at most `max_age` seconds old.
+        Lets a burst of open ended queries (to_block=None) share a single eth_blockNumber call.
+        """
+        fetched_at, head = self._heads.get(self.network.name, (None, None))
+        if head is None or time.monotonic() - fetched_at > max_age:
+            return self.get_current_block_number()
+        return head
+
     def get_balance(
         self,
         address: str,
         tag: Union[str, dict, None] = "latest",
+        max_age: float = 0,
     ) -> int:
         """
         params:
             address: address to get balance of
             tag:  "latest", "earliest", "pending", or an dict with a block number
             ie: {"blockNumber": "0x1"}
+            max_age: Seconds a previously fetched balance can be reused for. Defaults to 0, always fetching
 
         returns:
             balance of address (int)
         """
         tag = tag.lower() if isinstance(tag, str) else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getBalance",
-            "params": [address, tag],
-        }
-        json_response = self._handle_api_call(payload)
-        return int(json_response.get("result"), 16)
+        result = self._recent_call("eth_getBalance", [address, tag], max_age)
+        return int(result, 16)
 
     def get_code(self, address: str, tag: Union[str, dict, None] = "latest") -> str:
         """Returns code at a given address.
@@ -193,14 +345,24 @@ class EVM_Node:
             str: Code at given address
         """
         tag = tag.lower() if isinstance(tag, str) else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getCode",
-            "params": [address, tag],
-        }
+        cache_key = None
+        if isinstance(tag, str) and tag not in POSSIBLE_BLOCK_TAGS:
+            cache_key = (
+                self.network.name,
+                "eth_getCode",
+                normalize_address(address),
+                tag,
+            )
+            code = self._cache.get(cache_key)
+            if code is not None:
+                return code
+        payload = self._rpc("eth_getCode", [address, tag])
         json_response = self._handle_api_call(payload)
-        return json_response.get("result")
+        code = json_response.get("result")
+        # Code at a recent block can still be reorged away, so only final blocks are cached
+        if cache_key is not None and self._is_final_block(to_int(tag)):
+            self._cache.set(cache_key, code)
+        return code
 
     def get_transaction_count(
         self, address: str, tag: Union[str, dict, None] = "latest"
@@ -216,12 +378,7 @@ class EVM_Node:
             int: Number of transactions sent from an address
         """
         tag = tag.lower() if isinstance(tag, str) else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getTransactionCount",
-            "params": [address, tag],
-        }
+        payload = self._rpc("eth_getTransactionCount", [address, tag])
         json_response = self._handle_api_call(payload)
         return int(json_response.get("result"), 16)
 
@@ -243,12 +400,9 @@ class EVM_Node:
             str: The value at this storage position.
         """
         tag = tag.lower() if isinstance(tag, str) else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getStorageAt",
-            "params": [address, HexIntStringNumber(storage_position).hex, tag],
-        }
+        payload = self._rpc(
+            "eth_getStorageAt", [address, to_hex(storage_position), tag]
+        )
         json_response = self._handle_api_call(payload)
         return json_response.get("result")
 
@@ -261,14 +415,8 @@ class EVM_Node:
         Returns:
             int: Number of transactions in a block from a block matching the given block hash.
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getBlockTransactionCountByHash",
-            "params": [block_hash],
-        }
-        json_response = self._handle_api_call(payload)
-        return int(json_response.get("result"), 16)
+        result = self._cached_call("eth_getBlockTransactionCountByHash", [block_hash])
+        return int(result, 16)
 
     def get_block_transaction_count_by_number(self, tag: Union[int, str]) -> int:
         """Returns the number of transactions in a block from a block matching the given block number.
@@ -280,13 +428,8 @@ class EVM_Node:
         Returns:
             int: Number of transactions in a block from a block matching the given block number.
         """
-        tag_hex = HexIntStringNumber(tag).hex if tag not in POSSIBLE_BLOCK_TAGS else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getBlockTransactionCountByNumber",
-            "params": [tag_hex],
-        }
+        tag_hex = to_block_tag(tag)
+        payload = self._rpc("eth_getBlockTransactionCountByNumber", [tag_hex])
         json_response = self._handle_api_call(payload)
         return int(json_response.get("result"), 16)
 
@@ -299,14 +442,8 @@ class EVM_Node:
         Returns:
             int: Number of uncles in a block from a block matching the given block hash.
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getUncleCountByBlockHash",
-            "params": [block_hash],
-        }
-        json_response = self._handle_api_call(payload)
-        return int(json_response.get("result"), 16)
+        result = self._cached_call("eth_getUncleCountByBlockHash", [block_hash])
+        return int(result, 16)
 
     def get_uncle_count_by_block_number(self, tag: Union[int, str]) -> int:
         """Returns the number of uncles in a block from a block matching the given block number.
@@ -318,13 +455,8 @@ class EVM_Node:
         Returns:
             int: Number of uncles in a block from a block matching the given block number.
         """
-        tag_hex = HexIntStringNumber(tag).hex if tag not in POSSIBLE_BLOCK_TAGS else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getUncleCountByBlockNumber",
-            "params": [tag_hex],
-        }
+        tag_hex = to_block_tag(tag)
+        payload = self._rpc("eth_getUncleCountByBlockNumber", [tag_hex])
         json_response = self._handle_api_call(payload)
         return int(json_response.get("result"), 16)
 
@@ -340,14 +472,22 @@ class EVM_Node:
         Returns:
             dict: Block data
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getBlockByHash",
-            "params": [block_hash, full_transaction_objects],
-        }
+        cache_key = (
+            self.network.name,
+            "eth_getBlockByHash",
+            block_hash.lower(),
+            bool(full_transaction_objects),
+        )
+        block = self._cache.get(cache_key)
+        if block is not None:
+            return block
+        payload = self._rpc(
+            "eth_getBlockByHash", [block_hash, full_transaction_objects]
+        )
         json_response = self._handle_api_call(payload)
-        return json_response.get("result", {})
+        block = json_response.get("result", {})
+        self._cache.set(cache_key, block)
+        return block
 
     def get_block_by_number(
         self, tag: Union[int, str], full_transaction_objects: Optional[bool] = False
@@ -362,15 +502,25 @@ class EVM_Node:
         Returns:
             dict: Block data
         """
-        tag_hex = HexIntStringNumber(tag).hex if tag not in POSSIBLE_BLOCK_TAGS else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getBlockByNumber",
-            "params": [tag_hex, full_transaction_objects],
-        }
+        tag_hex = to_block_tag(tag)
+        cache_key = None
+        if tag_hex not in POSSIBLE_BLOCK_TAGS:
+            cache_key = (
+                self.network.name,
+                "eth_getBlockByNumber",
+                tag_hex,
+                bool(full_transaction_objects),
+            )
+            block = self._cache.get(cache_key)
+            if block is not None:
+                return block
+        payload = self._rpc("eth_getBlockByNumber", [tag_hex, full_transaction_objects])
         json_response = self._handle_api_call(payload)
-        return json_response.get("result", {})
+        block = json_response.get("result", {})
+        # Recent blocks can still be reorged away, so only blocks behind the safe head are cached
+        if cache_key is not None and self._is_final_block(to_int(tag_hex)):
+            self._cache.set(cache_key, block)
+        return block
 
     def get_current_block(self) -> dict:
         """
@@ -391,14 +541,12 @@ class EVM_Node:
         """
         if not isinstance(transaction_hash, str):
             raise TypeError("transaction_hash must be a string")
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getTransactionByHash",
-            "params": [transaction_hash],
-        }
-        json_response = self._handle_api_call(payload)
-        return json_response.get("result", {})
+        return self._cached_call(
+            "eth_getTransactionByHash",
+            [transaction_hash],
+            default={},
+            is_final=self._is_final_result,
+        )
 
     def get_transaction_by_block_hash_and_index(
         self, block_hash: str, index: int
@@ -414,14 +562,11 @@ class EVM_Node:
         """
         if not isinstance(block_hash, str):
             raise TypeError("block_hash must be a string")
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getTransactionByBlockHashAndIndex",
-            "params": [block_hash, HexIntStringNumber(index).hex],
-        }
-        json_response = self._handle_api_call(payload)
-        return json_response.get("result", {})
+        return self._cached_call(
+            "eth_getTransactionByBlockHashAndIndex",
+            [block_hash, to_hex(index)],
+            default={},
+        )
 
     def get_transaction_by_block_number_and_index(
         self, tag: Union[int, str], index: int
@@ -436,13 +581,11 @@ class EVM_Node:
         Returns:
             dict: Transaction data
         """
-        tag_hex = HexIntStringNumber(tag).hex if tag not in POSSIBLE_BLOCK_TAGS else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getTransactionByBlockNumberAndIndex",
-            "params": [tag_hex, HexIntStringNumber(index).hex],
-        }
+        tag_hex = to_block_tag(tag)
+        payload = self._rpc(
+            "eth_getTransactionByBlockNumberAndIndex",
+            [tag_hex, to_hex(index)],
+        )
         json_response = self._handle_api_call(payload)
         return json_response.get("result", {})
 
@@ -455,15 +598,12 @@ class EVM_Node:
         """
         if not isinstance(transaction_hash, str):
             raise TypeError("transaction_hash must be a string")
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getTransactionReceipt",
-            "params": [transaction_hash],
-        }
-        json_response = self._handle_api_call(payload)
-        result = json_response.get("result", {})
-        return result
+        return self._cached_call(
+            "eth_getTransactionReceipt",
+            [transaction_hash],
+            default={},
+            is_final=self._is_final_result,
+        )
 
     def get_uncle_by_block_hash_and_index(self, block_hash: str, index: int) -> dict:
         """
@@ -475,15 +615,11 @@ class EVM_Node:
         """
         if not isinstance(block_hash, str):
             raise TypeError("block_hash must be a string")
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getUncleByBlockHashAndIndex",
-            "params": [block_hash, HexIntStringNumber(index).hex],
-        }
-        json_response = self._handle_api_call(payload)
-        result = json_response.get("result", {})
-        return result
+        return self._cached_call(
+            "eth_getUncleByBlockHashAndIndex",
+            [block_hash, to_hex(index)],
+            default={},
+        )
 
     # make a function for eth_getUncleByBlockNumberAndIndex
 
@@ -497,13 +633,11 @@ class EVM_Node:
         returns:
             uncle data
         """
-        tag_hex = HexIntStringNumber(tag).hex if tag not in POSSIBLE_BLOCK_TAGS else tag
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getUncleByBlockNumberAndIndex",
-            "params": [tag_hex, HexIntStringNumber(index).hex],
-        }
+        tag_hex = to_block_tag(tag)
+        payload = self._rpc(
+            "eth_getUncleByBlockNumberAndIndex",
+            [tag_hex, to_hex(index)],
+        )
         json_response = self._handle_api_call(payload)
         result = json_response.get("result", {})
         return result
@@ -515,12 +649,7 @@ class EVM_Node:
         returns:
             client version string
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "web3_clientVersion",
-            "params": [],
-        }
+        payload = self._rpc("web3_clientVersion")
         json_response = self._handle_api_call(payload)
         result = json_response.get("result", "")
         return result
@@ -536,12 +665,7 @@ class EVM_Node:
             raise TypeError("data must be a string")
         if not data.startswith("0x"):
             data = hex(int.from_bytes(data.encode(), "big"))
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "web3_sha3",
-            "params": [data],
-        }
+        payload = self._rpc("web3_sha3", [data])
         json_response = self._handle_api_call(payload)
         result = json_response.get("result", "")
         return result
@@ -553,15 +677,7 @@ class EVM_Node:
         returns:
             network version string
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "net_version",
-            "params": [],
-        }
-        json_response = self._handle_api_call(payload)
-        result = json_response.get("result", "")
-        return result
+        return self._cached_call("net_version", [], default="")
 
     def net_listening(self) -> bool:
         """
@@ -570,12 +686,7 @@ class EVM_Node:
         returns:
             True if client is actively listening for network connections
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "net_listening",
-            "params": [],
-        }
+        payload = self._rpc("net_listening")
         json_response = self._handle_api_call(payload)
         result = json_response.get("result", False)
         return result
@@ -605,15 +716,7 @@ class EVM_Node:
         returns:
             ethereum protocol version string
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_protocolVersion",
-            "params": [],
-        }
-        json_response = self._handle_api_call(payload)
-        result = json_response.get("result", "")
-        return result
+        return self._cached_call("eth_protocolVersion", [], default="")
 
     def syncing(self) -> Union[bool, dict]:
         """
@@ -622,12 +725,7 @@ class EVM_Node:
         returns:
             False if not syncing, otherwise a dictionary with sync status info
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_syncing",
-            "params": [],
-        }
+        payload = self._rpc("eth_syncing")
         json_response = self._handle_api_call(payload)
         result = json_response.get("result", False)
         return result
@@ -686,22 +784,15 @@ class EVM_Node:
     #     result = json_response.get("result", "")
     #     return result
 
-    def gas_price(self) -> int:
+    def gas_price(self, max_age: float = 0) -> int:
         """
         params:
-            None
+            max_age: Seconds a previously fetched gas price can be reused for. Defaults to 0, always fetching
         returns:
             current gas price in wei
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_gasPrice",
-            "params": [],
-        }
-        json_response = self._handle_api_call(payload)
-        result = json_response.get("result", "0")
-        return HexIntStringNumber(result).int
+        result = self._recent_call("eth_gasPrice", [], max_age, default="0")
+        return to_int(result)
 
     def get_gas_price(self) -> int:
         """
@@ -727,7 +818,7 @@ class EVM_Node:
     #         "params": [],
     #     }
     #     json_response = self._handle_api_call(payload)
-    #     result = json_response.get("result", [])
+    #     result = json_response.get("result")
     #     return result
 
     # Unsupported by Alchemy
@@ -745,7 +836,7 @@ class EVM_Node:
     #         "params": [],
     #     }
     #     json_response = self._handle_api_call(payload)
-    #     result = json_response.get("result", [])
+    #     result = json_response.get("result")
     #     return result
 
     def get_logs(
@@ -763,6 +854,7 @@ class EVM_Node:
         topics: Union[List[str], str],
         from_block: Union[str, int, None] = 0,
         to_block: Union[str, int, None] = "latest",
+        concurrency: Optional[int] = DEFAULT_CONCURRENCY,
     ) -> list:
         """
         params:
@@ -770,21 +862,89 @@ class EVM_Node:
             topics: list of topics to filter by (event signatures)
             from_block: block number, or one of "earliest", "latest", "pending"
             to_block: block number, or one of "earliest", "latest", "pending"
+            concurrency: If the range has too many logs for one response, how many pieces of it to fetch
+            at the same time. Pieces that are still too big are split in half until they fit.
 
         returns: A dictionary, result[block] = block_date
         """
         topics = topics if isinstance(topics, list) else [topics]
-        from_block_hex = from_block
-        to_block_hex = to_block
-        if from_block not in POSSIBLE_BLOCK_TAGS:
-            from_block_hex = HexIntStringNumber(from_block).hex
-        if to_block not in POSSIBLE_BLOCK_TAGS:
-            to_block_hex = HexIntStringNumber(to_block).hex
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_getLogs",
-            "params": [
+        from_block = to_block_tag(from_block)
+        to_block = to_block_tag(to_block)
+        try:
+            return self._get_logs(contract_address, topics, from_block, to_block)
+        except ConnectionError as error:
+            from_block = "0x0" if from_block == "earliest" else from_block
+            if (
+                not _is_log_response_too_large(error)
+                or from_block in POSSIBLE_BLOCK_TAGS
+                or to_block == "earliest"
+            ):
+                raise
+        if to_block in POSSIBLE_BLOCK_TAGS:
+            to_block = self.get_current_block_number()
+
+        def get_shard(shard: Tuple[int, int]) -> list:
+            shard_from, shard_to = shard
+            try:
+                return self._get_logs(
+                    contract_address, topics, to_hex(shard_from), to_hex(shard_to)
+                )
+            except ConnectionError as error:
+                if shard_from == shard_to or not _is_log_response_too_large(error):
+                    raise
+            middle = (shard_from + shard_to) // 2
+            return get_shard((shard_from, middle)) + get_shard((middle + 1, shard_to))
+
+        shards = self._split_block_range(from_block, to_block, concurrency)
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            return [log for logs in executor.map(get_shard, shards) for log in logs]
+
+    def iter_events(
+        self,
+        contract_address: str,
+        topics: Union[List[str], str],
+        from_block: Union[str, int, None] = 0,
+        to_block: Union[str, int, None] = "latest",
+    ) -> Iterator[dict]:
+        """Lazily yields the logs of a single eth_getLogs call. If ijson is installed, each log is parsed as
+        the response streams in, so at most one is held in memory at a time. Unlike `get_events`, a range
+        with too many logs for one response isn't split up, it raises a ConnectionError.
+
+        params:
+            Same as `get_events`
+        returns:
+            an iterator over the logs
+        """
+        topics = topics if isinstance(topics, list) else [topics]
+        payload = self._get_logs_payload(
+            contract_address, topics, to_block_tag(from_block), to_block_tag(to_block)
+        )
+        yield from self._handle_streamed_api_call(payload, "result.item")
+
+    def _get_logs(
+        self,
+        contract_address: str,
+        topics: List[str],
+        from_block_hex: str,
+        to_block_hex: str,
+    ) -> list:
+        payload = self._get_logs_payload(
+            contract_address, topics, from_block_hex, to_block_hex
+        )
+        json_response = self._handle_api_call(payload)
+        result = json_response.get("result", {})
+        return result
+
+    def _get_logs_payload(
+        self,
+        contract_address: str,
+        topics: List[str],
+        from_block_hex: str,
+        to_block_hex: str,
+    ) -> dict:
+        return self._rpc(
+            "eth_getLogs",
+            [
                 {
                     "address": contract_address,
                     "fromBlock": from_block_hex,
@@ -792,10 +952,7 @@ class EVM_Node:
                     "topics": topics,
                 }
             ],
-        }
-        json_response = self._handle_api_call(payload)
-        result = json_response.get("result", {})
-        return result
+        )
 
     def send_raw_transactions(self, data: str) -> str:
         """
@@ -805,12 +962,7 @@ class EVM_Node:
 
         Note: I ain't bothering to test this.
         """
-        payload = {
-            "id": self.call_id,
-            "jsonrpc": "2.0",
-            "method": "eth_sendRawTransaction",
-            "params": [data],
-        }
+        payload = self._rpc("eth_sendRawTransaction", [data])
         json_response = self._handle_api_call(payload)
         result = json_response.get("result", "")
         return result
@@ -819,6 +971,24 @@ class EVM_Node:
     ################ Internal/Raw Methods ######################
     ############################################################
 
+    def _rpc(
+        self, method: str, params: Optional[list] = None, id_offset: int = 0
+    ) -> dict:
+        """Builds a JSON-RPC payload.
+
+        params:
+            method: the RPC method to call
+            params: the parameters to pass to the method
+            id_offset: added to the current call id, so every payload in a batch gets a unique id
+        returns: the payload
+        """
+        return {
+            "id": self.call_id + id_offset,
+            "jsonrpc": JSONRPC_VERSION,
+            "method": method,
+            "params": [] if params is None else params,
+        }
+
     def _handle_api_call(
         self,
         payload: dict,
@@ -835,28 +1005,447 @@ class EVM_Node:
         returns: a dictionary of the response
         """
         url = self.base_url if url is None else url
-        headers = HEADERS
-        if endpoint is not None:
-            headers["Alchemy-Python-Sdk-Method"] = endpoint
-        response = requests.post(url, json=payload, headers=headers, proxies=self.proxy)
-        if response.status_code != 200:
-            retries_here = 0
-            while retries_here < self.retries and response.status_code != 200:
-                retries_here = retries_here + 1
-                response = requests.post(
-                    url, json=payload, headers=headers, proxies=self.proxy
-                )
-            if response.status_code != 200:
-                raise ConnectionError(
-                    f'Status {response.status_code} when querying "{self.base_url_without_key}<REDACTED_API_KEY>/" with payload {payload}:\n >>> Response with Error: {response.text}'
-                )
-        json_response = response.json()
+        # The id is left out, so identical calls made at the same time share one request
+        key = self._coalesce_key(url, payload["method"], payload.get("params"))
+        return self._coalesce(key, self._send_api_call, payload, endpoint, url)
+
+    def _send_api_call(self, payload: dict, endpoint: Optional[str], url: str) -> dict:
+        headers = self._method_headers(endpoint)
+        data = json_dumps(payload)
+        retries = self.retries or 0
+        # Rate limits reported inside a 200 response can't be retried by urllib3, so they're retried here
+        for attempt in range(retries + 1):
+            response = self._post(url, data, headers, f"payload {payload}")
+            json_response = json_loads(response.content)
+            if attempt == retries or not self._is_rate_limited(json_response):
+                break
+            time.sleep(self._retry_backoff(attempt))
+        self._check_json_response(
+            json_response, response.status_code, response.content, payload
+        )
+        self.call_id = self.call_id + 1
+        return json_response
+
+    def _cached_call(
+        self,
+        method: str,
+        params: list,
+        default: Any = None,
+        is_final: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Makes a JSON-RPC call whose result can't change once it exists, ie: anything looked up by a block
+        hash, and caches it by (network, method, params). Results that are null, or that `is_final` rejects,
+        aren't cached so they get asked for again.
+
+        Args:
+            method (str): The JSON-RPC method
+            params (list): Its params. Hashes are compared case-insensitively.
+            default (Any, optional): Returned if the response has no result. Defaults to None.
+            is_final (Optional[Callable[[Any], bool]], optional): Extra check a result must pass to be cached,
+            ie: that a transaction's block is behind the safe head. Defaults to None.
+
+        Returns:
+            Any: The call's result
+        """
+        cache_key = self._rpc_cache_key(method, params)
+        result = self._cache.get(cache_key)
+        if result is not None:
+            return result
+        json_response = self._handle_api_call(self._rpc(method, params))
+        result = json_response.get("result", default)
+        if result and (is_final is None or is_final(result)):
+            self._cache.set(cache_key, result)
+        return result
+
+    def _split_block_range(
+        self,
+        from_block: Union[int, str],
+        to_block: Union[int, str],
+        concurrency: Optional[int],
+    ) -> List[Tuple[int, int]]:
+        """Splits an inclusive block range into at most `concurrency` contiguous shards."""
+        from_block_int = to_int(from_block)
+        to_block_int = to_int(to_block)
+        shard_count = max(1, min(concurrency or 1, to_block_int - from_block_int + 1))
+        shard_size = (to_block_int - from_block_int + 1) // shard_count
+        shards = []
+        for shard_index in range(shard_count):
+            shard_from = from_block_int + shard_index * shard_size
+            shard_to = (
+                to_block_int
+                if shard_index == shard_count - 1
+                else shard_from + shard_size - 1
+            )
+            shards.append((shard_from, shard_to))
+        return shards
+
+    def _recent_call(
+        self, method: str, params: list, max_age: float, default: Any = None
+    ) -> Any:
+        """Makes a JSON-RPC call whose result changes over time, reusing the last result for the same
+        (network, method, params) if it's at most `max_age` seconds old.
+        """
+        if max_age <= 0:
+            json_response = self._handle_api_call(self._rpc(method, params))
+            return json_response.get("result", default)
+        cache_key = self._rpc_cache_key(method, params)
+        result = self._get_recent(cache_key, max_age)
+        if result is not None:
+            return result
+        json_response = self._handle_api_call(self._rpc(method, params))
+        result = json_response.get("result", default)
+        self._set_recent(cache_key, result)
+        return result
+
+    def _get_recent(self, cache_key: Hashable, max_age: float) -> Any:
+        """The result last stored under `cache_key` by `_set_recent`, or None if there is none or it's
+        more than `max_age` seconds old.
+        """
+        fetched_at, result = self._recent.get(cache_key, (None, None))
+        if result is None or max_age <= 0 or time.monotonic() - fetched_at > max_age:
+            return None
+        return result
+
+    def _set_recent(self, cache_key: Hashable, result: Any):
+        self._recent.set(cache_key, (time.monotonic(), result))
+
+    def _is_rate_limited(self, json_response: Union[dict, list]) -> bool:
+        """Whether a JSON-RPC response is a rate limit error sent back with a 200 status."""
+        error = json_response.get("error") if isinstance(json_response, dict) else None
+        if (
+            not isinstance(error, dict)
+            or error.get("code") not in RATE_LIMIT_ERROR_CODES
+        ):
+            return False
+        # -32005 also means an eth_getLogs range has too many logs, which retrying won't fix
+        message = str(error.get("message", "")).lower()
+        return not any(text in message for text in LOG_RESPONSE_TOO_LARGE_ERRORS)
+
+    def _rpc_cache_key(self, method: str, params: list) -> tuple:
+        return (self.network.name, method, json_dumps(params).lower())
+
+    def _coalesce_key(self, url: str, *values: Any) -> tuple:
+        """A hashable key for a request, built with the stdlib json so uint256 params and dict order are fine."""
+        return (url,) + tuple(
+            json.dumps(value, sort_keys=True, separators=(",", ":")) for value in values
+        )
+
+    def _coalesce(self, key: Hashable, send: Callable[..., Any], *args) -> Any:
+        """Calls `send(*args)`, unless a call with the same key is already in flight on another
+        thread, in which case it waits for that call and returns (or raises) what it did.
+        Every caller sharing a call gets its own copy of the result.
+
+        params:
+            key: what identifies identical calls, ie: the url, method and params of a payload
+            send: the function that actually makes the call
+            args: the arguments to pass to `send`
+        returns: whatever `send` returns
+        """
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            is_leader = call is None
+            if is_leader:
+                # [the shared call, how many other callers are waiting on it]
+                call = self._inflight[key] = [Future(), 0]
+            else:
+                call[1] = call[1] + 1
+        future = call[0]
+        if not is_leader:
+            return copy.deepcopy(future.result())
+        try:
+            result = send(*args)
+        except BaseException as error:
+            with self._inflight_lock:
+                del self._inflight[key]
+            future.set_exception(error)
+            raise
+        with self._inflight_lock:
+            del self._inflight[key]
+            is_shared = call[1] > 0
+        future.set_result(result)
+        # The waiters copy the result in the future, so the leader can't be handed that same object
+        return copy.deepcopy(result) if is_shared else result
+
+    def _handle_batch_api_call(
+        self,
+        payloads: List[dict],
+        endpoint: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> List[dict]:
+        """Sends a list of JSON-RPC payloads to Alchemy in a single HTTP request (a JSON-RPC 2.0 batch).
+
+        params:
+            payloads: the list of payloads to send to the API, each with a unique "id"
+            endpoint: the endpoint to send the payloads to
+            url: the url to send the payloads to
+        returns: a list of the responses, in the same order as the payloads
+        """
+        if len(payloads) == 0:
+            return []
+        url = self.base_url if url is None else url
+        headers = self._method_headers(endpoint)
+        response = self._post(
+            url,
+            json_dumps(payloads),
+            headers,
+            f"a batch of {len(payloads)} payloads",
+        )
+        ordered_responses = self._order_batch_responses(
+            payloads,
+            json_loads(response.content),
+            response.status_code,
+            response.content,
+        )
+        self.call_id = self.call_id + len(payloads)
+        return ordered_responses
+
+    def _map_batches(
+        self,
+        payload_batches: Iterable[List[dict]],
+        concurrency: Optional[int] = DEFAULT_CONCURRENCY,
+    ) -> Iterator[List[dict]]:
+        """Sends several JSON-RPC batches at once, each on its own thread. Batches are only pulled from
+        `payload_batches` as there's room for them, so a lazy iterator of batches stays lazy.
+
+        params:
+            payload_batches: the batches of payloads to send, each sent as a single HTTP request
+            concurrency: how many batches to have in flight at the same time
+        returns: an iterator of the responses of each batch, in the same order as the batches
+        """
+        payload_batches = iter(payload_batches)
+        first_batches = list(islice(payload_batches, 2))
+        if concurrency is None or concurrency <= 1 or len(first_batches) < 2:
+            yield from map(self._handle_batch_api_call, first_batches)
+            yield from map(self._handle_batch_api_call, payload_batches)
+            return
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            in_flight = deque(
+                executor.submit(self._handle_batch_api_call, payloads)
+                for payloads in first_batches
+            )
+            for payloads in payload_batches:
+                if len(in_flight) >= concurrency:
+                    yield in_flight.popleft().result()
+                in_flight.append(executor.submit(self._handle_batch_api_call, payloads))
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def _check_json_response(
+        self,
+        json_response: dict,
+        status_code: int,
+        text: Union[bytes, str, dict],
+        payload: dict,
+    ):
+        """Raises a ConnectionError if a JSON-RPC response has no result or has an error.
+
+        params:
+            json_response: the parsed response
+            status_code: the HTTP status of the response
+            text: the raw response, for the error message. Bytes are only decoded if there's an error
+            payload: the payload that was sent, for the error message
+        """
         if (
             json_response.get("result", None) is None
             or json_response.get("error", None) is not None
         ):
+            if isinstance(text, bytes):
+                text = text.decode(errors="replace")
+            raise ConnectionError(
+                f'Status {status_code} when querying "{self.base_url_without_key}<REDACTED_API_KEY>/" with payload {payload}:\n >>> Response with Error: {text}'
+            )
+
+    def _order_batch_responses(
+        self,
+        payloads: List[dict],
+        json_responses: Any,
+        status_code: int,
+        text: Union[bytes, str],
+    ) -> List[dict]:
+        """Matches the responses of a JSON-RPC batch back up with their payloads by "id".
+
+        params:
+            payloads: the payloads that were sent
+            json_responses: the parsed response, which should be a list
+            status_code: the HTTP status of the response
+            text: the raw response, for the error message
+        returns: a list of the responses, in the same order as the payloads
+        """
+        if not isinstance(json_responses, list):
+            if isinstance(text, bytes):
+                text = text.decode(errors="replace")
             raise ConnectionError(
-                f'Status {response.status_code} when querying "{self.base_url_without_key}<REDACTED_API_KEY>/" with payload {payload}:\n >>> Response with Error: {response.text}'
+                f'Status {status_code} when querying "{self.base_url_without_key}<REDACTED_API_KEY>/" with a batch of {len(payloads)} payloads:\n >>> Response with Error: {text}'
+            )
+        responses_by_id = {
+            json_response.get("id"): json_response for json_response in json_responses
+        }
+        ordered_responses = []
+        for payload in payloads:
+            json_response = responses_by_id.get(payload["id"], {})
+            self._check_json_response(
+                json_response, status_code, json_response, payload
             )
+            ordered_responses.append(json_response)
+        return ordered_responses
+
+    def _handle_streamed_api_call(
+        self,
+        payload: dict,
+        item_path: str,
+        endpoint: Optional[str] = None,
+        url: Optional[str] = None,
+        captured: Optional[dict] = None,
+    ) -> Iterator[Any]:
+        """Like `_handle_api_call`, but lazily yields the items at `item_path` as the response is read.
+        If ijson isn't installed it falls back to parsing the whole response.
+
+        params:
+            payload: the payload to send to the API
+            item_path: where the items live in the response, in ijson's prefix format, ie: "result.receipts.item"
+            endpoint: the endpoint to send the payload to
+            url: the url to send the payload to
+            captured: a dict keyed by the prefixes of other values to keep, ie: {"result.pageKey": None}.
+            The values are filled in as they're read, so they're only complete once the items are used up
+        returns: an iterator over the items
+        """
+        if ijson is None:
+            json_response = self._handle_api_call(payload, endpoint=endpoint, url=url)
+            for prefix in captured or {}:
+                for value in _iter_items_at_path(json_response, prefix.split(".")):
+                    captured[prefix] = value
+            yield from _iter_items_at_path(json_response, item_path.split("."))
+            return
+        url = self.base_url if url is None else url
+        headers = self._method_headers(endpoint)
+        response = self._post(
+            url, json_dumps(payload), headers, f"payload {payload}", stream=True
+        )
         self.call_id = self.call_id + 1
-        return json_response
+        try:
+            response.raw.decode_content = True
+            events = self._raise_on_error_events(
+                ijson.parse(response.raw, use_float=True), payload
+            )
+            if captured:
+                events = _capture_values(events, captured)
+            yield from ijson.items(events, item_path)
+        finally:
+            response.close()
+
+    def _raise_on_error_events(self, events: Iterator[tuple], payload: dict):
+        """Passes ijson parse events through, raising if the response turns out to be a JSON-RPC error
+        or has no result, like `_check_json_response` does.
+        """
+        has_result = False
+        for prefix, event, value in events:
+            if prefix == "error" and event != "null":
+                raise ConnectionError(
+                    f'Error when querying "{self.base_url_without_key}<REDACTED_API_KEY>/" with payload {payload}'
+                )
+            if prefix == "result" and event != "null":
+                has_result = True
+            yield prefix, event, value
+        if not has_result:
+            raise ConnectionError(
+                f'No result when querying "{self.base_url_without_key}<REDACTED_API_KEY>/" with payload {payload}'
+            )
+
+    def _method_headers(self, endpoint: Optional[str] = None) -> Optional[dict]:
+        """The per-request headers. The JSON headers are already set on the session.
+
+        params:
+            endpoint: the SDK method being called, sent so Alchemy can attribute the request
+        returns: the extra headers, or None if there are none
+        """
+        if endpoint is None:
+            return None
+        return _endpoint_headers(endpoint)
+
+    def _post(
+        self,
+        url: str,
+        data: bytes,
+        headers: Optional[dict],
+        description: str,
+        stream: bool = False,
+    ) -> requests.Response:
+        """POSTs to Alchemy. The session retries up to `self.retries` times on a rate limit or server error.
+
+        params:
+            url: the url to send the data to
+            data: the encoded JSON body
+            headers: any headers to send on top of the session's
+            description: what was sent, for error messages
+            stream: whether to stream the response body
+        returns: the response
+        """
+        response = self._session.post(
+            url, data=data, headers=headers, proxies=self.proxy, stream=stream
+        )
+        if response.status_code != 200:
+            raise ConnectionError(
+                f'Status {response.status_code} when querying "{self.base_url_without_key}<REDACTED_API_KEY>/" with {description}:\n >>> Response with Error: {response.text}'
+            )
+        return response
+
+
+class _JitteredRetry(Retry):
+    """A urllib3 Retry with its backoff capped at `max_backoff` and up to `jitter` random seconds added.
+    urllib3 1.26 has neither option, so they're added here instead of relying on urllib3 2's.
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_backoff: float = MAX_RETRY_BACKOFF,
+        jitter: float = RETRY_JITTER,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def new(self, **kwargs) -> "_JitteredRetry":
+        retry = super().new(**kwargs)
+        retry.max_backoff = self.max_backoff
+        retry.jitter = self.jitter
+        return retry
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return min(self.max_backoff, backoff) + random.uniform(0, self.jitter)
+
+
+@lru_cache(maxsize=None)
+def _endpoint_headers(endpoint: str) -> dict:
+    """Built once per endpoint. Never mutated: requests and aiohttp merge it into a new dict."""
+    return {"Alchemy-Python-Sdk-Method": endpoint}
+
+
+def _is_log_response_too_large(error: ConnectionError) -> bool:
+    message = str(error).lower()
+    return any(text in message for text in LOG_RESPONSE_TOO_LARGE_ERRORS)
+
+
+def _capture_values(events: Iterator[tuple], captured: dict) -> Iterator[tuple]:
+    """Passes ijson parse events through, storing the scalars whose prefix is a key of `captured`."""
+    for prefix, event, value in events:
+        if prefix in captured and event in SCALAR_EVENTS:
+            captured[prefix] = value
+        yield prefix, event, value
+
+
+def _iter_items_at_path(obj: Any, path: List[str]) -> Iterator[Any]:
+    """Walks an already parsed response the same way ijson walks a prefix like "result.receipts.item"."""
+    if not path:
+        yield obj
+        return
+    key, rest = path[0], path[1:]
+    if key == "item":
+        for item in obj or []:
+            yield from _iter_items_at_path(item, rest)
+    elif isinstance(obj, dict) and key in obj:
+        yield from _iter_items_at_path(obj[key], rest)
@@ -1,4 +1,5 @@
-from typing import Union
+from functools import lru_cache
+from typing import Tuple, Union
 from .errors import NETWORK_INITIALIZATION_ERROR
 
 network_id_map = {
@@ -29,6 +30,20 @@ network_id_map = {
 }
 
 
+@lru_cache(maxsize=None)
+def get_network_urls(network_name: str) -> Tuple[str, str]:
+    """Builds (and remembers) the url pieces for a network.
+
+    Args:
+        network_name (str): The network name, ie: "eth_mainnet"
+
+    Returns:
+        Tuple[str, str]: The url network name ie: "eth-mainnet", and the base url without the API key
+    """
+    url_network_name = network_name.replace("_", "-")
+    return url_network_name, f"https://{url_network_name}.g.alchemy.com/v2/"
+
+
 class Network:
     def __init__(self, name_or_chain_id: Union[str, int, None] = "eth_mainnet"):
         """Creates an instance of a Network class, which is an easy way to access the chain ID and name of a network.
@@ -1,6 +1,48 @@
-from typing import Union
+import copy
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Hashable, Iterable, Iterator, List, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
 
 ETH_NULL_VALUE: str = "0x"
+POSSIBLE_BLOCK_TAGS = frozenset({"latest", "earliest", "pending", "safe", "finalized"})
+
+
+def json_dumps(obj: Any) -> bytes:
+    """
+    params:
+        obj: Object to serialize
+    returns:
+        The object as JSON bytes, using orjson if it's installed
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson only handles 64-bit ints, ie: a uint256 token id has to go through json
+            pass
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    params:
+        data: JSON bytes or string, ie: the raw body of a response
+    returns:
+        The parsed object, using orjson if it's installed
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def is_hash(string: str) -> bool:
@@ -19,6 +61,25 @@ def is_hash(string: str) -> bool:
     return True
 
 
+def classify_block_identifier(value: Union[str, int]) -> str:
+    """Works out what kind of block identifier a value is in one pass, instead of trying
+    `is_hash`, `is_hex_int` and the block tags one after another.
+
+    params:
+        value: A block tag ("latest", any case), a block hash, a hex block number ("0x1" or "0X1"),
+        or an int/str block number
+    returns:
+        "tag", "hash", "hex_int", or "int"
+    """
+    if not isinstance(value, str):
+        return "int"
+    if value[:2].lower() == "0x":
+        return "hash" if len(value) == 66 else "hex_int"
+    if value.lower() in POSSIBLE_BLOCK_TAGS:
+        return "tag"
+    return "int"
+
+
 def is_hex_int(string: str) -> bool:
     """
     params:
@@ -35,6 +96,72 @@ def is_hex_int(string: str) -> bool:
         return False
 
 
+def to_hex(value: Union[str, int]) -> str:
+    """
+    params:
+        value: int (1), hex ("0x1" or "0X1"), or str "1"
+    returns:
+        The value as a hex string, without building a HexIntStringNumber
+    """
+    if isinstance(value, str) and value[:2].lower() == "0x":
+        return "0x" + value[2:]
+    return hex(int(value))
+
+
+def to_block_tag(value: Union[str, int]) -> str:
+    """
+    params:
+        value: A block tag ("latest", any case), or an int (1), hex ("0x1"), or str "1" block number
+    returns:
+        The lowercased tag, or the block number as a hex string
+    """
+    if value in POSSIBLE_BLOCK_TAGS:
+        return value
+    if isinstance(value, str) and value.lower() in POSSIBLE_BLOCK_TAGS:
+        return value.lower()
+    return to_hex(value)
+
+
+def to_int(value: Union[str, int]) -> int:
+    """
+    params:
+        value: int (1), hex ("0x1" or "0X1"), or str "1"
+    returns:
+        The value as an int, without building a HexIntStringNumber
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value[:2].lower() == "0x":
+        return int(value, 16)
+    return int(value)
+
+
+@lru_cache(maxsize=1024)
+def normalize_address(address: str) -> str:
+    """
+    params:
+        address: Address to normalize
+    returns:
+        The lowercased address. Repeated addresses return the same cached string.
+    """
+    return address.lower()
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    params:
+        iterable: Anything to split up, ie: a list or a range of block numbers
+        size: The max length of each chunk
+    returns:
+        An iterator of lists of at most `size` items, without materializing the whole iterable
+    """
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
 def bytes32_to_text(bytes_to_convert: str) -> str:
     """
     params:
@@ -83,3 +210,100 @@ class HexIntStringNumber:
     @property
     def hexString(self) -> str:
         return self.hex_string
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 4096, copy_values: bool = False):
+        """A small thread-safe least-recently-used cache.
+
+        Args:
+            maxsize (int, optional): The most entries to keep before evicting the oldest. Defaults to 4096.
+            copy_values (bool, optional): Deep copy values going in and out, so changing a value that was
+            set or got doesn't change what's cached. Defaults to False.
+        """
+        self.maxsize = maxsize
+        self.copy_values = copy_values
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            value = self._data[key]
+        return copy.deepcopy(value) if self.copy_values else value
+
+    def set(self, key: Hashable, value: Any):
+        if self.copy_values:
+            value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        """A small set-like filter of addresses that can answer "definitely not in here" without storing them.
+        It can give false positives, but never false negatives.
+
+        Args:
+            capacity (int): How many items you expect to add.
+            false_positive_rate (float, optional): The chance a missing item looks present. Defaults to 0.01.
+        """
+        capacity = max(1, capacity)
+        self.size = max(
+            8, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_addresses(
+        cls, addresses: Iterable[str], false_positive_rate: float = 0.01
+    ) -> "BloomFilter":
+        """
+        params:
+            addresses: The addresses to add, ie: every known contract address
+            false_positive_rate: The chance a missing address looks present
+        returns:
+            A BloomFilter with every address added
+        """
+        addresses = list(addresses)
+        bloom = cls(len(addresses), false_positive_rate)
+        for address in addresses:
+            bloom.add(address)
+        return bloom
+
+    def _positions(self, item: str) -> Iterator[int]:
+        digest = hashlib.blake2b(
+            normalize_address(item).encode(), digest_size=16
+        ).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
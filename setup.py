@@ -41,6 +41,11 @@ setup(
         "requests",
         "urllib3",
     ],
+    extras_require={
+        "fast": ["orjson", "ijson", "brotli"],
+        "async": ["aiohttp"],
+        "websocket": ["websockets>=11"],
+    },
     packages=[about["__title__"]],
     python_requires=">=3.7, <4",
     url="https://github.com/alphachainio/alchemy_sdk_py",
@@ -74,6 +74,26 @@ def test_get_asset_transfers_all(alchemy_with_key):
     assert len(transfers) == expected_transfers_number
 
 
+def test_iter_asset_transfers(alchemy_with_key):
+    # Arrange
+    start_block = 0
+    end_block = 16291530
+    to_address = "0xa5D0084A766203b463b3164DFc49D91509C12daB"
+    category = ["erc20"]
+    expected_transfers_number = 14185
+
+    # Act
+    transfers = alchemy_with_key.iter_asset_transfers(
+        to_address=to_address,
+        from_block=start_block,
+        to_block=end_block,
+        category=category,
+    )
+
+    # Assert
+    assert sum(1 for _ in transfers) == expected_transfers_number
+
+
 def test_get_transaction_receipts(alchemy_with_key):
     # Arrange
     block_number = 16292979
@@ -94,6 +114,20 @@ def test_find_contract_deployer(alchemy_with_key):
     assert block_number == expected_block_number
 
 
+def test_find_contract_deployer_ignores_address_case(alchemy_with_key):
+    # Arrange
+    expected_block_number = 4281611
+
+    # Act
+    deployer_address, block_number = alchemy_with_key.find_contract_deployer(
+        CHAINLINK_ADDRESS.lower()
+    )
+
+    # Assert
+    assert deployer_address.lower() == CHAINLINK_CREATOR.lower()
+    assert block_number == expected_block_number
+
+
 def test_get_max_priority_fee_per_gas(alchemy_with_key):
     response = alchemy_with_key.get_max_priority_fee_per_gas()
     assert response > 0
@@ -112,6 +146,20 @@ def test_fee_data(alchemy_with_key):
     assert fee_data["gas_price"] > 0
 
 
+def test_get_datetime_of_blocks(alchemy_with_key):
+    # Arrange
+    from_block = 16000000
+    to_block = 16000005
+
+    # Act
+    block_datetimes = alchemy_with_key.get_datetime_of_blocks(
+        from_block=from_block, to_block=to_block, batch_size=2
+    )
+
+    # Assert
+    assert list(block_datetimes.keys()) == list(range(from_block, to_block))
+
+
 def test_get_token_balances_with_address_and_contract_list(alchemy_with_key):
     contract = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
     response = alchemy_with_key.get_token_balances(VITALIK, [contract])
@@ -212,6 +260,22 @@ def test_get_contract_metadata(alchemy_with_key):
     )
 
 
+def test_get_contract_metadata_batch(alchemy_with_key):
+    response = alchemy_with_key.get_contract_metadata_batch([ENS, ETH_BLOCKS])
+    assert len(response) == 2
+    assert (
+        response[0]["contractMetadata"]["openSea"]["collectionName"]
+        == "ENS: Ethereum Name Service"
+    )
+
+
+def test_get_nft_metadata_batch(alchemy_with_key):
+    response = alchemy_with_key.get_nft_metadata_batch(
+        [(ENS, PATRICK_ALPHA_C_TOKEN_ID_ENS)]
+    )
+    assert response[0]["title"].lower() == "patrickalphac.eth"
+
+
 def test_get_nfts_for_contract(alchemy_with_key):
     response = alchemy_with_key.get_nfts_for_contract(ENS, limit=5)
     assert len(response["nfts"]) == 5
@@ -260,3 +324,16 @@ def test_alchemy_get_transaction(alchemy_with_key):
         "0x7ac79af930a26f05ef3ae4b3f9e38cb7323696232aea00e3d3e04394ab1c7234"
     )
     assert response["from"].lower() == PATRICK_ALPHA_C.lower()
+
+
+def test_get_token_metadata_is_cached(alchemy_with_key):
+    # Arrange
+    first_response = alchemy_with_key.get_token_metadata(CHAINLINK_ADDRESS)
+    call_id = alchemy_with_key.call_id
+
+    # Act
+    second_response = alchemy_with_key.get_token_metadata(CHAINLINK_ADDRESS.lower())
+
+    # Assert
+    assert second_response == first_response
+    assert alchemy_with_key.call_id == call_id
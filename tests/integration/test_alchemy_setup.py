@@ -1,7 +1,9 @@
 import os
 import pytest
-from alchemy_sdk_py import Alchemy
+from alchemy_sdk_py import Alchemy, BloomFilter
 from _pytest.monkeypatch import MonkeyPatch
+from alchemy_sdk_py.evm_node import HEADERS
+from tests.test_data import CHAINLINK_ADDRESS, VITALIK
 
 
 def test_initialize_empty_network(dummy_api_key, mock_env_missing):
@@ -44,3 +46,45 @@ def test_key_with_environment_variable(monkeypatch: MonkeyPatch):
     monkeypatch.setenv("ALCHEMY_API_KEY", test_key)
     alchemy = Alchemy()
     assert alchemy.key == test_key
+
+
+def test_set_network_updates_urls(dummy_api_key):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy.set_network("matic_mainnet")
+    assert alchemy.network == "matic_mainnet"
+    assert alchemy.base_url.startswith("https://matic-mainnet.g.alchemy.com/v2/")
+    assert alchemy.nft_url.startswith("https://matic-mainnet.g.alchemy.com/nft/v2/")
+
+
+def test_set_api_key_updates_urls(dummy_api_key):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy.set_api_key("new_key")
+    assert alchemy.base_url == "https://eth-mainnet.g.alchemy.com/v2/new_key"
+    assert alchemy.nft_url.endswith("/nft/v2/new_key")
+
+
+def test_known_contracts_rejects_unknown_address(dummy_api_key):
+    known_contracts = BloomFilter.from_addresses([CHAINLINK_ADDRESS])
+    alchemy = Alchemy(api_key=dummy_api_key, known_contracts=known_contracts)
+    assert CHAINLINK_ADDRESS.lower() in known_contracts
+    with pytest.raises(ValueError):
+        alchemy.find_contract_deployer(VITALIK)
+
+
+def test_method_headers_do_not_leak_into_other_requests(dummy_api_key):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    headers_before = dict(HEADERS)
+    method_headers = alchemy._method_headers("getNFTs")
+    assert method_headers == {"Alchemy-Python-Sdk-Method": "getNFTs"}
+    assert alchemy._method_headers("getNFTs") is method_headers
+    assert alchemy._method_headers() is None
+    assert HEADERS == headers_before
+    assert "Alchemy-Python-Sdk-Method" not in alchemy._session.headers
+
+
+def test_context_manager_closes_session(dummy_api_key, monkeypatch):
+    closed = []
+    with Alchemy(api_key=dummy_api_key) as alchemy:
+        monkeypatch.setattr(alchemy._session, "close", lambda: closed.append(True))
+        assert alchemy.api_key == dummy_api_key
+    assert closed == [True]
@@ -0,0 +1,51 @@
+import asyncio
+
+from alchemy_sdk_py import AsyncAlchemy
+
+
+def test_aget_current_block_number():
+    # Arrange
+    async def get_block_number():
+        async with AsyncAlchemy() as alchemy:
+            return await alchemy.aget_current_block_number()
+
+    # Act
+    current_block = asyncio.run(get_block_number())
+
+    # Assert
+    assert current_block > 0
+
+
+def test_aget_datetime_of_blocks():
+    # Arrange
+    from_block = 16000000
+    to_block = 16000005
+
+    async def get_datetimes():
+        async with AsyncAlchemy() as alchemy:
+            return await alchemy.aget_datetime_of_blocks(
+                from_block=from_block, to_block=to_block, batch_size=2
+            )
+
+    # Act
+    block_datetimes = asyncio.run(get_datetimes())
+
+    # Assert
+    assert sorted(block_datetimes.keys()) == list(range(from_block, to_block))
+
+
+def test_aget_block():
+    # Arrange
+    block_numbers = [16000000, 16000001, 16000002]
+
+    async def get_blocks():
+        async with AsyncAlchemy() as alchemy:
+            return await asyncio.gather(
+                *(alchemy.aget_block(block_number) for block_number in block_numbers)
+            )
+
+    # Act
+    blocks = asyncio.run(get_blocks())
+
+    # Assert
+    assert [int(block["number"], 16) for block in blocks] == block_numbers
@@ -0,0 +1,121 @@
+import io
+import time
+
+import pytest
+from alchemy_sdk_py.utils import json_dumps, json_loads
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.content = json_dumps(body)
+        self.text = self.content.decode()
+        self.status_code = status_code
+        self.raw = io.BytesIO(self.content)
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Stands in for the requests session, answering every call with `handler(method, url, params, body)`."""
+
+    def __init__(self, handler, delay=0):
+        self.handler = handler
+        self.delay = delay
+        self.calls = []
+
+    def get(self, url, params=None, **kwargs):
+        return self._respond("GET", url, params, None)
+
+    def post(self, url, data=None, **kwargs):
+        return self._respond("POST", url, None, json_loads(data))
+
+    def _respond(self, method, url, params, body):
+        self.calls.append((method, url, params, body))
+        time.sleep(self.delay)
+        return FakeResponse(self.handler(method, url, params, body))
+
+    def close(self):
+        pass
+
+
+class FakeAiohttpResponse:
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+        self.headers = {}
+
+    async def read(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FakeAiohttpSession:
+    """Stands in for the aiohttp session, answering every request with `status` and `body`."""
+
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+        self.closed = False
+        self.requests = 0
+
+    def request(self, method, url, **kwargs):
+        self.requests = self.requests + 1
+        return FakeAiohttpResponse(self.status, self.body)
+
+    async def close(self):
+        self.closed = True
+
+
+def _rpc_handler(results):
+    """A FakeSession handler answering JSON-RPC calls (single or batched) with `results[method](params)`."""
+
+    def respond(payload):
+        result = results[payload["method"]](payload["params"])
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": result}
+
+    def handler(method, url, params, body):
+        if isinstance(body, list):
+            return [respond(payload) for payload in body]
+        return respond(body)
+
+    return handler
+
+
+def _rate_limited_then(result):
+    """A FakeSession handler that rate limits the first call inside a 200 response, then answers with `result`."""
+    responses = [{"jsonrpc": "2.0", "id": 1, "error": {"code": 429, "message": "cups"}}]
+
+    def handler(method, url, params, body):
+        if responses:
+            return responses.pop()
+        return {"jsonrpc": "2.0", "id": body["id"], "result": result}
+
+    return handler
+
+
+@pytest.fixture
+def fake_session():
+    """Builds a FakeSession to swap in for a node's requests session, ie: `alchemy._session = fake_session(handler)`."""
+    return FakeSession
+
+
+@pytest.fixture
+def fake_aiohttp_session():
+    """Builds a FakeAiohttpSession to swap in for an async node's aiohttp session."""
+    return FakeAiohttpSession
+
+
+@pytest.fixture
+def rpc_handler():
+    return _rpc_handler
+
+
+@pytest.fixture
+def rate_limited_then():
+    return _rate_limited_then
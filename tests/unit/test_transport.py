@@ -0,0 +1,449 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from alchemy_sdk_py import Alchemy, AsyncAlchemy
+from alchemy_sdk_py.evm_node import DEFAULT_CACHE_SIZE
+from alchemy_sdk_py.utils import json_dumps, json_loads
+from tests.test_data import CHAINLINK_ADDRESS, VITALIK
+
+
+def test_json_dumps_serializes_ints_wider_than_64_bits():
+    assert json_loads(json_dumps({"tokenId": 2**255})) == {"tokenId": 2**255}
+
+
+def test_identical_concurrent_calls_share_one_request(dummy_api_key, fake_session):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    token_id = 2**255 + 1
+    alchemy._session = fake_session(
+        lambda method, url, params, body: {"owners": [params["tokenId"]]}, delay=0.2
+    )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(
+            executor.map(
+                lambda _: alchemy.get_owners_for_token(CHAINLINK_ADDRESS, token_id),
+                range(4),
+            )
+        )
+
+    assert responses == [{"owners": [str(token_id)]}] * 4
+    assert len(alchemy._session.calls) == 1
+
+
+def test_fresh_balances_do_not_evict_cached_results(dummy_api_key, fake_session):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(lambda method, url, params, body: {"result": "0x1"})
+    alchemy._cache.set("final", True)
+
+    for index in range(DEFAULT_CACHE_SIZE + 1):
+        alchemy.get_balance(hex(index))
+    alchemy.get_balance(VITALIK, max_age=60)
+    alchemy.get_balance(VITALIK, max_age=60)
+
+    assert alchemy._cache.get("final") is True
+    assert len(alchemy._session.calls) == DEFAULT_CACHE_SIZE + 2
+
+
+def test_finality_checks_do_not_fetch_the_head(
+    dummy_api_key, fake_session, rpc_handler
+):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(
+        rpc_handler(
+            {
+                "eth_blockNumber": lambda params: "0x100",
+                "eth_getBlockByNumber": lambda params: {
+                    "number": params[0],
+                    "timestamp": "0x5",
+                },
+            }
+        )
+    )
+
+    alchemy.get_current_block()
+    alchemy.get_datetime_of_blocks(blocks=[0xFF])
+
+    assert len(alchemy._session.calls) == 3
+
+
+def test_transaction_receipts_are_cached_once_final(
+    dummy_api_key, fake_session, rpc_handler
+):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(
+        rpc_handler(
+            {
+                "eth_blockNumber": lambda params: "0x100",
+                "eth_getTransactionReceipt": lambda params: {"blockNumber": "0x10"},
+            }
+        )
+    )
+    transaction_hash = "0x" + "ab" * 32
+
+    alchemy.get_transaction_receipt(transaction_hash)
+    assert len(alchemy._session.calls) == 1
+    alchemy.get_current_block_number()
+    alchemy.get_transaction_receipt(transaction_hash)
+    alchemy.get_transaction_receipt(transaction_hash.upper().replace("0X", "0x"))
+
+    assert len(alchemy._session.calls) == 3
+
+
+def test_rate_limit_errors_with_a_200_status_are_retried(
+    dummy_api_key, fake_session, rate_limited_then
+):
+    alchemy = Alchemy(api_key=dummy_api_key, retries=2, base_backoff=0, jitter=0)
+    alchemy._session = fake_session(rate_limited_then("0x10"))
+
+    assert alchemy.get_current_block_number() == 16
+    assert len(alchemy._session.calls) == 2
+
+
+def test_async_rate_limit_errors_with_a_200_status_are_retried(
+    dummy_api_key, rate_limited_then
+):
+    alchemy = AsyncAlchemy(api_key=dummy_api_key, retries=2, base_backoff=0, jitter=0)
+    handler = rate_limited_then("0x10")
+    calls = []
+
+    async def apost(url, data, headers, description):
+        calls.append(data)
+        return 200, b"", handler("POST", url, None, json_loads(data))
+
+    alchemy._apost = apost
+
+    assert asyncio.run(alchemy.aget_current_block_number()) == 16
+    assert len(calls) == 2
+
+
+def test_too_many_logs_errors_are_split_rather_than_retried(
+    dummy_api_key, fake_session
+):
+    alchemy = Alchemy(api_key=dummy_api_key, retries=3, base_backoff=10, jitter=0)
+
+    def handler(method, url, params, body):
+        log_filter = body["params"][0]
+        if log_filter["fromBlock"] != log_filter["toBlock"]:
+            error = {
+                "code": -32005,
+                "message": "query returned more than 10000 results",
+            }
+            return {"jsonrpc": "2.0", "id": body["id"], "error": error}
+        return {"jsonrpc": "2.0", "id": body["id"], "result": [log_filter["fromBlock"]]}
+
+    alchemy._session = fake_session(handler)
+
+    logs = alchemy.get_events(CHAINLINK_ADDRESS, [], 0, 1, concurrency=1)
+
+    assert logs == ["0x0", "0x1"]
+    assert len(alchemy._session.calls) == 4
+
+
+def test_get_events_bisects_ranges_with_too_many_logs(dummy_api_key, fake_session):
+    alchemy = Alchemy(api_key=dummy_api_key)
+
+    def handler(method, url, params, body):
+        log_filter = body["params"][0]
+        from_block = int(log_filter["fromBlock"], 16)
+        to_block = int(log_filter["toBlock"], 16)
+        if to_block - from_block + 1 > 8:
+            error = {"code": -32602, "message": "Log response size exceeded."}
+            return {"jsonrpc": "2.0", "id": body["id"], "error": error}
+        logs = [
+            {"blockNumber": hex(block)} for block in range(from_block, to_block + 1)
+        ]
+        return {"jsonrpc": "2.0", "id": body["id"], "result": logs}
+
+    alchemy._session = fake_session(handler)
+
+    logs = alchemy.get_events(CHAINLINK_ADDRESS, [], 0, 63, concurrency=4)
+
+    assert [int(log["blockNumber"], 16) for log in logs] == list(range(64))
+    # 1 whole range + 4 shards of 16 blocks, each split once into two halves of 8
+    assert len(alchemy._session.calls) == 1 + 4 * 3
+
+
+def test_map_batches_pulls_batches_lazily(dummy_api_key, fake_session, rpc_handler):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(rpc_handler({"eth_chainId": lambda params: "0x1"}))
+    pulled = []
+
+    def payload_batches():
+        for index in range(100):
+            pulled.append(index)
+            yield [alchemy._rpc("eth_chainId")]
+
+    responses = alchemy._map_batches(payload_batches(), concurrency=4)
+    next(responses)
+
+    assert len(pulled) <= 5
+    assert len(list(responses)) == 99
+
+
+def test_async_server_errors_with_retries_none(dummy_api_key, fake_aiohttp_session):
+    alchemy = AsyncAlchemy(api_key=dummy_api_key, retries=None)
+    session = fake_aiohttp_session(503, b'{"error": "unavailable"}')
+
+    async def get_block_number():
+        alchemy._async_session = session
+        alchemy._semaphore = asyncio.Semaphore(alchemy.max_concurrency)
+        return await alchemy.aget_current_block_number()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(get_block_number())
+    assert session.requests == 1
+
+
+def test_aget_block_accepts_tags_in_any_case(dummy_api_key):
+    alchemy = AsyncAlchemy(api_key=dummy_api_key)
+    sent = []
+
+    async def ahandle_api_call(payload, endpoint=None, url=None):
+        sent.append(payload["params"])
+        return {"result": {"number": "0x10"}}
+
+    alchemy._ahandle_api_call = ahandle_api_call
+
+    assert asyncio.run(alchemy.aget_block("LATEST")) == {"number": "0x10"}
+    assert sent == [["latest", False]]
+
+
+@pytest.mark.parametrize("body", [{"result": None}, {"jsonrpc": "2.0", "id": 1}])
+def test_streamed_calls_raise_on_a_missing_result(dummy_api_key, body, fake_session):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(lambda method, url, params, request: body)
+
+    with pytest.raises(ConnectionError):
+        list(alchemy.iter_events(CHAINLINK_ADDRESS, []))
+
+
+def test_streamed_calls_yield_nothing_for_an_empty_result(dummy_api_key, fake_session):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(lambda method, url, params, body: {"result": []})
+
+    assert list(alchemy.iter_events(CHAINLINK_ADDRESS, [])) == []
+
+
+@pytest.mark.parametrize("probes_per_round", [0, -1])
+def test_binary_search_first_block_rejects_rounds_without_probes(
+    dummy_api_key, fake_session, probes_per_round
+):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(lambda method, url, params, body: {})
+
+    with pytest.raises(ValueError):
+        alchemy.binary_search_first_block(
+            0, 100, CHAINLINK_ADDRESS, probes_per_round=probes_per_round
+        )
+    assert alchemy._session.calls == []
+
+
+def test_contract_metadata_is_only_reused_within_max_age(dummy_api_key, fake_session):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    floor_prices = iter(range(100))
+
+    def handler(method, url, params, body):
+        if method == "GET":
+            return {"openSea": {"floorPrice": next(floor_prices)}}
+        return [
+            {"openSea": {"floorPrice": next(floor_prices)}}
+            for _ in body["contractAddresses"]
+        ]
+
+    alchemy._session = fake_session(handler)
+
+    assert alchemy.get_contract_metadata(CHAINLINK_ADDRESS)["openSea"] == {
+        "floorPrice": 0
+    }
+    assert alchemy.get_contract_metadata(CHAINLINK_ADDRESS)["openSea"] == {
+        "floorPrice": 1
+    }
+    assert alchemy.get_contract_metadata(CHAINLINK_ADDRESS, max_age=60)["openSea"] == {
+        "floorPrice": 1
+    }
+    metadata = alchemy.get_contract_metadata_batch(
+        [CHAINLINK_ADDRESS, VITALIK], max_age=60
+    )
+    assert [contract["openSea"]["floorPrice"] for contract in metadata] == [1, 2]
+    assert (
+        alchemy._cache.get(
+            (alchemy.network.name, "getContractMetadata", CHAINLINK_ADDRESS.lower())
+        )
+        is None
+    )
+    assert len(alchemy._session.calls) == 3
+
+
+def test_code_is_only_cached_at_final_blocks(dummy_api_key, fake_session, rpc_handler):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(
+        rpc_handler(
+            {
+                "eth_blockNumber": lambda params: "0x100",
+                "eth_getCode": lambda params: "0x6080",
+            }
+        )
+    )
+    alchemy.get_current_block_number()
+
+    for _ in range(2):
+        alchemy.get_code(CHAINLINK_ADDRESS, hex(0x100 - 3))
+        alchemy.get_code(CHAINLINK_ADDRESS, "0x10")
+
+    # the head, twice at head-3 and once at the final block 0x10
+    assert len(alchemy._session.calls) == 4
+
+
+def test_setting_retries_later_applies_to_status_retries(dummy_api_key):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    assert alchemy._adapter.max_retries.total == 0
+
+    alchemy.retries = 3
+
+    retry = alchemy._session.get_adapter(alchemy.base_url).max_retries
+    assert retry.total == 3
+    assert retry.read == 0
+    assert retry.is_retry("POST", 503)
+
+
+def test_async_get_all_asset_transfers_matches_the_sync_order(
+    dummy_api_key, fake_session, rpc_handler
+):
+    alchemy = AsyncAlchemy(api_key=dummy_api_key)
+    sent = []
+
+    def transfers_between(params):
+        from_block = int(params["fromBlock"], 16)
+        to_block = int(params["toBlock"], 16)
+        return [
+            {"blockNum": hex(block), "uniqueId": f"{block}:{category}"}
+            for block in range(from_block, to_block + 1)
+            for category in params["category"]
+        ]
+
+    async def ahandle_api_call(payload, endpoint=None, url=None):
+        sent.append(payload["params"][0])
+        return {"result": {"transfers": transfers_between(payload["params"][0])}}
+
+    alchemy._ahandle_api_call = ahandle_api_call
+    alchemy._session = fake_session(
+        rpc_handler(
+            {
+                "alchemy_getAssetTransfers": lambda params: {
+                    "transfers": transfers_between(params[0])
+                }
+            }
+        )
+    )
+
+    transfers, _ = asyncio.run(
+        alchemy.aget_asset_transfers(
+            from_block=0, to_block=7, get_all_flag=True, concurrency=4
+        )
+    )
+    sync_transfers, _ = alchemy.get_asset_transfers(
+        from_block=0, to_block=7, get_all_flag=True, concurrency=4
+    )
+
+    assert transfers == sync_transfers
+    assert len(sent) == 4
+
+
+def test_changing_a_cached_result_does_not_change_the_cache(
+    dummy_api_key, fake_session, rpc_handler
+):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(
+        rpc_handler(
+            {"eth_getBlockByHash": lambda params: {"hash": params[0], "uncles": []}}
+        )
+    )
+    block_hash = "0x" + "ab" * 32
+
+    alchemy.get_block_by_hash(block_hash)["uncles"].append("first")
+    alchemy.get_block_by_hash(block_hash)["uncles"].append("second")
+
+    assert alchemy.get_block_by_hash(block_hash) == {"hash": block_hash, "uncles": []}
+    assert len(alchemy._session.calls) == 1
+
+
+def test_coalesced_callers_each_get_their_own_result(dummy_api_key, fake_session):
+    alchemy = Alchemy(api_key=dummy_api_key)
+    alchemy._session = fake_session(
+        lambda method, url, params, body: {"owners": []}, delay=0.2
+    )
+
+    def get_owners(index):
+        response = alchemy.get_owners_for_token(CHAINLINK_ADDRESS, 1)
+        response["owners"].append(index)
+        return response
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(get_owners, range(4)))
+
+    assert responses == [{"owners": [index]} for index in range(4)]
+    assert len(alchemy._session.calls) == 1
+
+
+def test_aget_datetime_of_blocks_caps_batches_in_flight(dummy_api_key):
+    alchemy = AsyncAlchemy(api_key=dummy_api_key)
+    in_flight = []
+    most_in_flight = []
+
+    async def ahandle_batch_api_call(payloads, endpoint=None, url=None):
+        in_flight.append(payloads)
+        most_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(payloads)
+        return [
+            {
+                "id": payload["id"],
+                "result": {"number": payload["params"][0], "timestamp": "0x5"},
+            }
+            for payload in payloads
+        ]
+
+    alchemy._ahandle_batch_api_call = ahandle_batch_api_call
+
+    result = asyncio.run(
+        alchemy.aget_datetime_of_blocks(
+            blocks=list(range(20)), batch_size=2, concurrency=3
+        )
+    )
+
+    assert sorted(result) == list(range(20))
+    assert max(most_in_flight) == 3
+
+
+def test_find_contract_deployer_records_the_head_it_fetches(
+    dummy_api_key, fake_session, rpc_handler
+):
+    alchemy = Alchemy(api_key=dummy_api_key)
+
+    def get_code(params):
+        if params[1] == "latest" or int(params[1], 16) >= 0x40:
+            return "0x6080"
+        return "0x"
+
+    alchemy._session = fake_session(
+        rpc_handler(
+            {
+                "eth_blockNumber": lambda params: "0x200",
+                "eth_getCode": get_code,
+                "alchemy_getTransactionReceipts": lambda params: {
+                    "receipts": [
+                        {"contractAddress": CHAINLINK_ADDRESS, "from": VITALIK}
+                    ]
+                },
+            }
+        )
+    )
+
+    assert alchemy.find_contract_deployer(CHAINLINK_ADDRESS) == (VITALIK, 0x40)
+    assert alchemy._heads[alchemy.network.name][1] == 0x200
+    assert (
+        alchemy._cache.get(
+            (alchemy.network.name, "eth_getCode", CHAINLINK_ADDRESS.lower(), "0x40")
+        )
+        == "0x6080"
+    )
@@ -0,0 +1,34 @@
+import pytest
+from alchemy_sdk_py.utils import (
+    classify_block_identifier,
+    to_block_tag,
+    to_hex,
+    to_int,
+)
+
+
+@pytest.mark.parametrize(
+    "value, kind",
+    [
+        ("latest", "tag"),
+        ("Latest", "tag"),
+        ("0x1a", "hex_int"),
+        ("0X1A", "hex_int"),
+        ("0X" + "AB" * 32, "hash"),
+        ("26", "int"),
+        (26, "int"),
+    ],
+)
+def test_classify_block_identifier_ignores_case(value, kind):
+    assert classify_block_identifier(value) == kind
+
+
+@pytest.mark.parametrize("value", ["0x1a", "0X1A", "26", 26])
+def test_block_number_helpers_agree_on_any_case(value):
+    assert to_int(value) == 26
+    assert to_int(to_hex(value)) == 26
+    assert to_block_tag(value).startswith("0x")
+
+
+def test_to_block_tag_lowercases_tags():
+    assert to_block_tag("FINALIZED") == "finalized"